@@ -1,17 +1,23 @@
+import json
 import logging
+from typing import AsyncGenerator
 
-from google.adk.agents import LlmAgent, SequentialAgent
+from google.adk.agents import BaseAgent, LlmAgent, SequentialAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.adk.memory import InMemoryMemoryService
 from google.adk.plugins.logging_plugin import LoggingPlugin
-from google.adk.code_executors import BuiltInCodeExecutor
 from google.adk.tools import preload_memory
+from google.genai import types
 
 from burnout_guardian.tools.calendar_tool import get_calendar_events
 from burnout_guardian.tools.worklog_tool import get_workdays
 from burnout_guardian.tools.checkins_tool import get_weekly_checkin
 from burnout_guardian.tools.profile_tool import get_profile_and_history
+from burnout_guardian.state_store import build_services
+from burnout_guardian.model_client import build_model
+from burnout_guardian.metrics import weekly_metrics_from_snapshot
+from burnout_guardian.validation import clean_json_fences
 
 
 MODEL_ID = "gemini-2.0-flash"
@@ -23,19 +29,57 @@ logging.basicConfig(
 
 
 async def auto_save_to_memory(callback_context):
-    """Automatically save the full session to memory after each agent turn."""
+    """Save a compact summary of this week to memory after each weekly report.
+
+    The memory service keeps only the week's metrics, risk and actions taken
+    from the session state, not the full session transcript.
+    """
     await callback_context._invocation_context.memory_service.add_session_to_memory(
         callback_context._invocation_context.session
     )
 
 
+class WorkloadAnalyzerAgent(BaseAgent):
+    """Computes weekly_metrics from the week_snapshot in session state, without an LLM.
+
+    It uses the same metric definitions as the incremental ingestion
+    (burnout_guardian.metrics), so mid-week numbers and threshold crossings
+    match the weekly report.
+    """
+
+    output_key: str = "weekly_metrics"
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        try:
+            raw = ctx.session.state.get("week_snapshot")
+            if isinstance(raw, str):
+                raw = json.loads(clean_json_fences(raw))
+            week_snapshot = raw["week_snapshot"]
+            user_profile = get_profile_and_history(week_snapshot["user_id"])["user_profile"]
+            text = json.dumps(
+                {"weekly_metrics": weekly_metrics_from_snapshot(week_snapshot, user_profile)}
+            )
+        except (TypeError, KeyError, ValueError) as e:
+            # Reported as the stage output, so the pipeline flags the stage as invalid.
+            text = f"Could not compute weekly_metrics: {e}"
+
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+            actions=EventActions(state_delta={self.output_key: text}),
+        )
+
+
 def build_burnout_guardian_agent() -> SequentialAgent:
     """Builds the main Burnout Guardian agent with its sub-agents."""
 
     data_collector = LlmAgent(
         name="data_collector",
-        model=MODEL_ID,
+        model=build_model("data_collector", MODEL_ID),
         description="Collects weekly work data (calendar, work log, check-ins).",
+        output_key="week_snapshot",
         instruction=(
             "Your job is to gather all relevant information about how the user worked "
             "during the given week.\n\n"
@@ -80,54 +124,17 @@ def build_burnout_guardian_agent() -> SequentialAgent:
         ],
     )
 
-    workload_analyzer = LlmAgent(
+    workload_analyzer = WorkloadAnalyzerAgent(
         name="workload_analyzer",
-        model=MODEL_ID,
-        code_executor=BuiltInCodeExecutor(),
         description="Turns a week of activity into simple metrics.",
-        instruction=(
-            "You receive as input the JSON produced by the data_collector.\n"
-            "It always has this structure:\n"
-            "{ \"week_snapshot\": { ... } }\n\n"
-            "From this, you calculate simple metrics for that week:\n"
-            "- total_hours: total hours worked in the period\n"
-            "- avg_hours_per_day\n"
-            "- late_evenings: number of days where work ended after the user's normal end time\n"
-            "- weekend_days_worked\n"
-            "- meeting_hours\n"
-            "- num_meetings\n"
-            "- days_without_real_breaks\n"
-            "- checkin_energy (if present)\n"
-            "- checkin_stress (if present)\n\n"
-            "You are allowed to write and execute small Python code snippets using the "
-            "built-in code execution tool to do time arithmetic or aggregations when needed. "
-            "Use code execution when computing durations, sums or averages across days.\n\n"
-            "You MUST respond with a JSON object called 'weekly_metrics' with exactly these keys:\n"
-            "{\n"
-            '  \"weekly_metrics\": {\n'
-            '    \"user_id\": \"...\",\n'
-            '    \"period_start\": \"YYYY-MM-DD\",\n'
-            '    \"period_end\": \"YYYY-MM-DD\",\n'
-            '    \"total_hours\": <float>,\n'
-            '    \"avg_hours_per_day\": <float>,\n'
-            '    \"late_evenings\": <int>,\n'
-            '    \"weekend_days_worked\": <int>,\n'
-            '    \"meeting_hours\": <float>,\n'
-            '    \"num_meetings\": <int>,\n'
-            '    \"days_without_real_breaks\": <int>,\n'
-            '    \"checkin_energy\": <int or null>,\n'
-            '    \"checkin_stress\": <int or null>\n'
-            "  }\n"
-            "}\n\n"
-            "Do NOT add natural language explanations. Only return that JSON."
-        ),
-        tools=[],
+        output_key="weekly_metrics",
     )
 
     risk_scorer = LlmAgent(
         name="risk_scorer",
-        model=MODEL_ID,
+        model=build_model("risk_scorer", MODEL_ID),
         description="Estimates burnout risk for the week.",
+        output_key="risk_assessment",
         instruction=(
             "You receive a JSON object with weekly_metrics for a given period.\n"
             "Before deciding anything, you MUST call the get_profile_and_history "
@@ -139,7 +146,8 @@ def build_burnout_guardian_agent() -> SequentialAgent:
             '    \"preferred_work_hours\": {\"start\": \"HH:MM\", \"end\": \"HH:MM\"},\n'
             '    \"max_hours_per_week\": <int>,\n'
             '    \"max_late_evenings_per_week\": <int>,\n'
-            '    \"allow_weekend_work\": <true|false>\n'
+            '    \"allow_weekend_work\": <true|false>,\n'
+            '    \"timezone\": \"Area/City\"\n'
             "  },\n"
             '  \"history_summary\": {\n'
             '    \"weeks_observed\": <int>,\n'
@@ -172,13 +180,15 @@ def build_burnout_guardian_agent() -> SequentialAgent:
 
     wellbeing_coach = LlmAgent(
         name="wellbeing_coach",
-        model=MODEL_ID,
+        model=build_model("wellbeing_coach", MODEL_ID),
         description="Explains what is going on and suggests small changes.",
+        output_key="weekly_report",
         instruction=(
             "You receive two JSON objects:\n"
             "- weekly_metrics: the numbers describing what happened this week.\n"
             "- risk_assessment: the risk level, score and reasons.\n\n"
-            "Before answering, you MAY load previous sessions from memory. "
+            "Before answering, you MAY load the summaries of previous weeks from memory "
+            "(one short line per week: risk, hours, late evenings, suggested actions). "
             "If memory has relevant past weeks for this same user, briefly compare "
             "the current week with the recent trend (for example: 'this is your third "
             "busy week in a row' or 'this week looks calmer than the last two').\n\n"
@@ -232,13 +242,29 @@ def build_burnout_guardian_agent() -> SequentialAgent:
 
 # --- services + runner ----------------------------------------------------
 
-session_service = InMemorySessionService()
-memory_service = InMemoryMemoryService()
+# In-memory by default; set BURNOUT_GUARDIAN_STATE_DB to share state between
+# worker processes (see burnout_guardian.app.serve_workers).
+session_service, memory_service = build_services()
+
+burnout_guardian_agent = build_burnout_guardian_agent()
 
 runner = Runner(
-    agent=build_burnout_guardian_agent(),
+    agent=burnout_guardian_agent,
     session_service=session_service,
     memory_service=memory_service,
     app_name="burnout_guardian",
     plugins=[LoggingPlugin()],
 )
+
+# One runner per stage over the same services, so the pipeline can validate
+# each stage output and retry only the stage that failed.
+stage_runners = [
+    Runner(
+        agent=stage,
+        session_service=session_service,
+        memory_service=memory_service,
+        app_name="burnout_guardian",
+        plugins=[LoggingPlugin()],
+    )
+    for stage in burnout_guardian_agent.sub_agents
+]
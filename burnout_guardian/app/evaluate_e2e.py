@@ -1,12 +1,88 @@
+import argparse
 import asyncio
 import json
+import math
+import time
+import uuid
+from dataclasses import dataclass, field
 from datetime import date
-from typing import Optional
-
-from google.genai import types
-
-from burnout_guardian.agent_app import runner
-from burnout_guardian.app.run_weekly_report import clean_json_fences
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from burnout_guardian.app.pipeline import PipelineResult, StageStats, run_pipeline
+from burnout_guardian.tools.fixtures import scenario_fixtures
+from burnout_guardian.tools.profile_tool import get_profile_and_history
+
+
+SCENARIOS_DIR = Path(__file__).parent / "scenarios"
+DEFAULT_EVAL_CONCURRENCY = 4
+
+# Anything with run_pipeline's signature: lets cheaper configurations be scored
+# against the same corpus.
+Pipeline = Callable[..., Awaitable[PipelineResult]]
+
+
+@dataclass
+class Scenario:
+    """A synthetic week with the risk band the pipeline is expected to land in."""
+
+    name: str
+    user_id: str
+    period_start: date
+    period_end: date
+    expected_risk_levels: List[str]
+    week: Dict[str, Any]
+    user_profile: Optional[Dict[str, Any]] = None
+    history_summary: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    expected_risk_levels: List[str]
+    risk_level: Optional[str] = None
+    valid: bool = False
+    errors: List[str] = field(default_factory=list)
+    latency_s: float = 0.0
+    stages: List[StageStats] = field(default_factory=list)
+
+    @property
+    def risk_correct(self) -> bool:
+        return self.valid and self.risk_level in self.expected_risk_levels
+
+
+def load_scenarios(directory: Path = SCENARIOS_DIR) -> List[Scenario]:
+    """Load every *.json scenario file of the corpus, sorted by name."""
+    scenarios = []
+    for path in sorted(Path(directory).glob("*.json")):
+        raw = json.loads(path.read_text())
+        scenarios.append(
+            Scenario(
+                name=raw["name"],
+                user_id=raw["user_id"],
+                period_start=date.fromisoformat(raw["period_start"]),
+                period_end=date.fromisoformat(raw["period_end"]),
+                expected_risk_levels=raw["expected_risk_levels"],
+                week=raw["week"],
+                user_profile=raw.get("user_profile"),
+                history_summary=raw.get("history_summary"),
+            )
+        )
+    return scenarios
+
+
+def _scenario_fixtures(scenario: Scenario):
+    """Make the tools serve the scenario's synthetic week and profile while it runs."""
+    defaults = get_profile_and_history(scenario.user_id)
+    return scenario_fixtures(
+        scenario.user_id,
+        scenario.period_start.isoformat(),
+        scenario.week,
+        {
+            "user_profile": {**defaults["user_profile"], **(scenario.user_profile or {})},
+            "history_summary": {**defaults["history_summary"], **(scenario.history_summary or {})},
+        },
+    )
 
 
 async def run_single_scenario(
@@ -15,98 +91,151 @@ async def run_single_scenario(
     period_start: date,
     period_end: date,
     session_id: Optional[str] = None,
-) -> None:
-    """Runs the full Burnout Guardian pipeline for one scenario and validates the output."""
+    pipeline: Pipeline = run_pipeline,
+) -> ScenarioResult:
+    """Run the staged pipeline for one user and week on the data the tools serve.
 
+    The result is valid only when every stage passed its schema; otherwise its
+    errors hold the reason the pipeline failed.
+    """
     if session_id is None:
-        session_id = f"eval-e2e-{scenario_name}"
-
-    prompt = (
-        "Run a weekly burnout check.\n\n"
-        f"user_id: {user_id}\n"
-        f"period_start: {period_start.isoformat()}\n"
-        f"period_end: {period_end.isoformat()}\n\n"
-        "Return ONLY the weekly_report JSON. Do not include explanations."
-    )
-
-    user_content = types.Content(
-        role="user",
-        parts=[types.Part(text=prompt)],
-    )
-
-    await runner.session_service.create_session(
-        app_name=runner.app_name,
-        user_id=user_id,
-        session_id=session_id,
-    )
-
-    final_text = None
-
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=user_content,
-    ):
-        if event.is_final_response() and event.content and event.content.parts:
-            text = event.content.parts[0].text
-            if text and text != "None":
-                final_text = text
-
-    if not final_text:
-        print(f"[{scenario_name}] No final response from agent")
-        return
-
-    cleaned = clean_json_fences(final_text)
+        session_id = f"eval-{scenario_name}-{uuid.uuid4().hex[:8]}"
 
+    result = ScenarioResult(name=scenario_name, expected_risk_levels=[])
+    started = time.perf_counter()
     try:
-        data = json.loads(cleaned)
-    except json.JSONDecodeError:
-        print(f"[{scenario_name}] Invalid JSON in final response")
-        print(cleaned)
-        return
-
-    weekly_report = data.get("weekly_report")
-    if not isinstance(weekly_report, dict):
-        print(f"[{scenario_name}] Missing or invalid 'weekly_report' object")
-        print(json.dumps(data, indent=2))
-        return
-
-    required_keys = [
-        "user_id",
-        "period_start",
-        "period_end",
-        "risk_level",
-        "summary_message",
-        "suggested_actions",
-    ]
-    missing = [k for k in required_keys if k not in weekly_report]
-    if missing:
-        print(f"[{scenario_name}] Missing keys in weekly_report: {missing}")
-        print(json.dumps(weekly_report, indent=2))
-        return
-
-    if not isinstance(weekly_report["suggested_actions"], list) or not weekly_report["suggested_actions"]:
-        print(f"[{scenario_name}] suggested_actions is missing or empty")
-        print(json.dumps(weekly_report, indent=2))
-        return
-
-    risk = weekly_report.get("risk_level")
-    print(f"[{scenario_name}] weekly_report OK (risk_level={risk})")
-
-
-async def run_all_e2e_evals() -> None:
-    """Runs end-to-end evaluation scenarios."""
-
-    await run_single_scenario(
-        scenario_name="demo_baseline_week",
-        user_id="demo-user",
-        period_start=date(2025, 11, 10),
-        period_end=date(2025, 11, 16),
-    )
+        run = await pipeline(
+            user_id=user_id,
+            period_start=period_start,
+            period_end=period_end,
+            session_id=session_id,
+        )
+    except Exception as e:
+        result.errors.append(str(e))
+    else:
+        result.valid = True
+        result.risk_level = run.data["weekly_report"].get("risk_level")
+        result.stages = run.stages
+    result.latency_s = time.perf_counter() - started
+    return result
+
+
+async def _run_corpus_scenario(scenario: Scenario, pipeline: Pipeline) -> ScenarioResult:
+    with _scenario_fixtures(scenario):
+        result = await run_single_scenario(
+            scenario.name,
+            scenario.user_id,
+            scenario.period_start,
+            scenario.period_end,
+            pipeline=pipeline,
+        )
+    result.expected_risk_levels = scenario.expected_risk_levels
+    return result
+
+
+async def run_corpus(
+    scenarios: List[Scenario],
+    max_concurrency: int = DEFAULT_EVAL_CONCURRENCY,
+    pipeline: Pipeline = run_pipeline,
+) -> List[ScenarioResult]:
+    """Run all scenarios concurrently, at most max_concurrency at a time."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(scenario: Scenario) -> ScenarioResult:
+        async with semaphore:
+            return await _run_corpus_scenario(scenario, pipeline)
+
+    return list(await asyncio.gather(*(run_one(scenario) for scenario in scenarios)))
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile, q in [0, 100]."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return round(ordered[rank - 1], 3)
+
+
+def build_scorecard(results: List[ScenarioResult], label: str = "default") -> Dict[str, Any]:
+    """Quality and cost summary of a corpus run."""
+    total = len(results)
+    valid = [result for result in results if result.valid]
+
+    def per_report(attr: str) -> Optional[float]:
+        if not valid:
+            return None
+        return round(sum(sum(getattr(s, attr) for s in r.stages) for r in valid) / len(valid), 2)
+
+    stage_latencies: Dict[str, List[float]] = {}
+    stage_attempts: Dict[str, List[int]] = {}
+    for result in valid:
+        for stats in result.stages:
+            stage_latencies.setdefault(stats.stage, []).append(stats.latency_s)
+            stage_attempts.setdefault(stats.stage, []).append(stats.attempts)
+
+    return {
+        "label": label,
+        "scenarios": total,
+        "risk_level_accuracy": (
+            round(sum(result.risk_correct for result in results) / total, 3) if total else None
+        ),
+        "schema_valid_rate": round(len(valid) / total, 3) if total else None,
+        "llm_calls_per_report": per_report("llm_calls"),
+        "prompt_tokens_per_report": per_report("prompt_tokens"),
+        "output_tokens_per_report": per_report("output_tokens"),
+        "report_latency_s": {
+            "p50": _percentile([result.latency_s for result in results], 50),
+            "p95": _percentile([result.latency_s for result in results], 95),
+        },
+        "stage_latency_s": {
+            stage: {"p50": _percentile(latencies, 50), "p95": _percentile(latencies, 95)}
+            for stage, latencies in stage_latencies.items()
+        },
+        "stage_avg_attempts": {
+            stage: round(sum(attempts) / len(attempts), 2)
+            for stage, attempts in stage_attempts.items()
+        },
+        "results": [
+            {
+                "name": result.name,
+                "expected_risk_levels": result.expected_risk_levels,
+                "risk_level": result.risk_level,
+                "valid": result.valid,
+                "errors": result.errors,
+            }
+            for result in results
+        ],
+    }
+
+
+async def run_all_e2e_evals(
+    scenarios_dir: Path = SCENARIOS_DIR,
+    max_concurrency: int = DEFAULT_EVAL_CONCURRENCY,
+    label: str = "default",
+) -> Dict[str, Any]:
+    """Runs the scenario corpus end to end and prints its scorecard."""
+
+    results = await run_corpus(load_scenarios(scenarios_dir), max_concurrency=max_concurrency)
+    scorecard = build_scorecard(results, label=label)
+    print(json.dumps(scorecard, indent=2))
+    return scorecard
 
 
 def main() -> None:
-    asyncio.run(run_all_e2e_evals())
+    parser = argparse.ArgumentParser(description="Run the Burnout Guardian evaluation corpus.")
+    parser.add_argument("--scenarios", type=Path, default=SCENARIOS_DIR)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_EVAL_CONCURRENCY)
+    parser.add_argument("--label", default="default", help="Name of the pipeline configuration.")
+    args = parser.parse_args()
+
+    asyncio.run(
+        run_all_e2e_evals(
+            scenarios_dir=args.scenarios,
+            max_concurrency=max(1, args.concurrency),
+            label=args.label,
+        )
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,186 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence
+
+from google.genai import types
+
+from burnout_guardian.agent_app import stage_runners
+from burnout_guardian.validation import STAGE_SCHEMAS, StageValidationError, validate_stage_output
+
+
+DEFAULT_MAX_STAGE_ATTEMPTS = 3
+
+
+@dataclass
+class StageStats:
+    """What one stage cost in a pipeline run."""
+
+    stage: str
+    attempts: int = 0
+    latency_s: float = 0.0
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+@dataclass
+class PipelineResult:
+    """Final weekly_report JSON plus every stage's validated output and stats."""
+
+    data: Dict[str, Any]
+    stage_outputs: Dict[str, Dict[str, Any]]
+    stages: List[StageStats]
+
+
+# Process-wide counters per stage: runs, attempts, retries, failures.
+_stage_counters: Dict[str, Dict[str, int]] = {
+    stage: {"runs": 0, "attempts": 0, "retries": 0, "failures": 0} for stage in STAGE_SCHEMAS
+}
+
+
+def stage_retry_counters() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of the per-stage counters, with the retry rate per run."""
+    snapshot = {}
+    for stage, counters in _stage_counters.items():
+        runs = counters["runs"]
+        snapshot[stage] = {
+            **counters,
+            "retry_rate": round(counters["retries"] / runs, 3) if runs else 0.0,
+        }
+    return snapshot
+
+
+# What each stage is asked to do; the period lines are added by build_prompt.
+STAGE_PROMPTS: Dict[str, str] = {
+    "data_collector": (
+        "Run a weekly burnout check. Collect the week's calendar events, workdays and check-in."
+    ),
+    "workload_analyzer": "Compute the weekly metrics from the week snapshot.",
+    "risk_scorer": "Estimate the burnout risk for this week from the weekly metrics.",
+    "wellbeing_coach": "Write the weekly report for this person.",
+}
+
+
+def build_prompt(stage: str, user_id: str, period_start: date, period_end: date) -> str:
+    """The message that starts one stage: its task, the period and its own output key."""
+    root_key = STAGE_SCHEMAS[stage][0]
+    return (
+        f"{STAGE_PROMPTS[stage]}\n\n"
+        f"user_id: {user_id}\n"
+        f"period_start: {period_start.isoformat()}\n"
+        f"period_end: {period_end.isoformat()}\n\n"
+        f"Return ONLY the {root_key} JSON. Do not include explanations."
+    )
+
+
+def _user_message(text: str) -> types.Content:
+    return types.Content(role="user", parts=[types.Part(text=text)])
+
+
+async def _run_stage_once(
+    runner, user_id: str, session_id: str, message: str, stats: StageStats
+) -> Optional[str]:
+    """Run one stage attempt and return its final text."""
+    final_text = None
+    async for event in runner.run_async(
+        user_id=user_id,
+        session_id=session_id,
+        new_message=_user_message(message),
+    ):
+        usage = getattr(event, "usage_metadata", None)
+        if usage is not None:
+            stats.llm_calls += 1
+            stats.prompt_tokens += usage.prompt_token_count or 0
+            stats.output_tokens += usage.candidates_token_count or 0
+
+        if event.is_final_response() and event.content and event.content.parts:
+            text = "".join(part.text for part in event.content.parts if part.text)
+            if text and text != "None":
+                final_text = text
+    return final_text
+
+
+async def run_pipeline(
+    user_id: str,
+    period_start: date,
+    period_end: date,
+    session_id: str,
+    max_stage_attempts: int = DEFAULT_MAX_STAGE_ATTEMPTS,
+    runners: Optional[Sequence[Any]] = None,
+) -> PipelineResult:
+    """Run the four stages one by one, validating each output as it arrives.
+
+    All stages share one session, so when a stage returns invalid output only
+    that stage is asked again (with the validation errors); earlier stages
+    are never re-run and their outputs stay in the session. A model call that
+    times out counts as a failed attempt of its stage.
+
+    Raises:
+        StageValidationError: a stage was still invalid (or timing out) after
+            max_stage_attempts.
+    """
+    runners = stage_runners if runners is None else runners
+
+    await runners[0].session_service.create_session(
+        app_name=runners[0].app_name,
+        user_id=user_id,
+        session_id=session_id,
+    )
+
+    stage_outputs: Dict[str, Dict[str, Any]] = {}
+    all_stats: List[StageStats] = []
+    data: Dict[str, Any] = {}
+
+    for runner in runners:
+        stage = runner.agent.name
+        root_key = STAGE_SCHEMAS[stage][0]
+        counters = _stage_counters[stage]
+        stats = StageStats(stage=stage)
+        all_stats.append(stats)
+        counters["runs"] += 1
+
+        # Every stage gets the period: it also keys the memory recall.
+        message = build_prompt(stage, user_id, period_start, period_end)
+        started = time.perf_counter()
+        while True:
+            stats.attempts += 1
+            counters["attempts"] += 1
+            try:
+                text = await _run_stage_once(runner, user_id, session_id, message, stats)
+            except asyncio.TimeoutError as e:
+                # A timed-out model call is a failed attempt; the same message is sent again.
+                timed_out = True
+                errors = [str(e) or f"Stage {stage} timed out"]
+            else:
+                timed_out = False
+                parsed, errors = validate_stage_output(stage, text)
+                if not errors:
+                    break
+
+            stats.errors.extend(errors)
+            if stats.attempts >= max_stage_attempts:
+                stats.latency_s = time.perf_counter() - started
+                counters["failures"] += 1
+                raise StageValidationError(stage, errors, stats.attempts)
+
+            counters["retries"] += 1
+            if timed_out:
+                continue
+            # The period stays in the message: it also keys the memory recall.
+            message = (
+                "Your previous answer was not valid: "
+                + "; ".join(errors)
+                + f".\n\nuser_id: {user_id}\n"
+                + f"period_start: {period_start.isoformat()}\n"
+                + f"period_end: {period_end.isoformat()}\n\n"
+                + f"Reply again with ONLY the '{root_key}' JSON, exactly as specified."
+            )
+        stats.latency_s = time.perf_counter() - started
+
+        stage_outputs[root_key] = parsed[root_key]
+        data = parsed
+
+    return PipelineResult(data=data, stage_outputs=stage_outputs, stages=all_stats)
@@ -1,75 +1,77 @@
 import asyncio
 from datetime import date
 import json
-from typing import Any, Dict
+import logging
+import uuid
+from typing import Any, Dict, Optional
 
-from google.genai import types
+from burnout_guardian.app.pipeline import DEFAULT_MAX_STAGE_ATTEMPTS, run_pipeline
+from burnout_guardian.rollups import rollup_engine
+from burnout_guardian.validation import clean_json_fences
 
-from burnout_guardian.agent_app import runner
 
+# clean_json_fences is re-exported for existing callers.
+__all__ = ["clean_json_fences", "new_session_id", "run_weekly_report"]
 
-def clean_json_fences(text: str) -> str:
-    """Remove ```json fences if present and return raw JSON."""
-    cleaned = text.strip()
-    if cleaned.startswith("```"):
-        cleaned = cleaned.lstrip("`")
-        if cleaned.lower().startswith("json"):
-            cleaned = cleaned[4:].strip()
-        if cleaned.endswith("```"):
-            cleaned = cleaned[:-3].strip()
-    return cleaned
+logger = logging.getLogger(__name__)
+
+
+def new_session_id(prefix: str, period_start: date) -> str:
+    """A session id that is unique across runs, workers and restarts."""
+    return f"{prefix}-{period_start.isoformat()}-{uuid.uuid4().hex[:8]}"
 
 
 async def run_weekly_report(
     user_id: str,
     period_start: date,
     period_end: date,
-    session_id: str = "weekly-demo-session",
+    session_id: Optional[str] = None,
+    max_stage_attempts: int = DEFAULT_MAX_STAGE_ATTEMPTS,
 ) -> Dict[str, Any]:
-    """Runs a full weekly burnout check for a given user and prints the report."""
-
-    prompt = (
-        "Run a weekly burnout check.\n\n"
-        f"user_id: {user_id}\n"
-        f"period_start: {period_start.isoformat()}\n"
-        f"period_end: {period_end.isoformat()}\n\n"
-        "Return ONLY the weekly_report JSON. Do not include explanations."
-    )
+    """Runs a full weekly burnout check for a given user and returns the report.
 
-    user_content = types.Content(
-        role="user",
-        parts=[types.Part(text=prompt)],
-    )
+    Without a session_id a new, unique one is used: session ids must not be
+    reused, and with a shared state database they outlive the process.
 
-    await runner.session_service.create_session(
-        app_name=runner.app_name,
+    Each stage output is validated as soon as it is produced; an invalid one
+    is retried on its own (up to max_stage_attempts) instead of re-running
+    the whole pipeline. Raises StageValidationError (a RuntimeError) if a
+    stage never produces valid output.
+    """
+    result = await run_pipeline(
         user_id=user_id,
-        session_id=session_id,
+        period_start=period_start,
+        period_end=period_end,
+        session_id=session_id or new_session_id("weekly", period_start),
+        max_stage_attempts=max_stage_attempts,
     )
 
-    final_text = None
+    await _record_rollups(
+        user_id, period_start, result.stage_outputs.get("weekly_metrics"), result.data
+    )
 
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=user_content,
-    ):
-        if event.is_final_response() and event.content and event.content.parts:
-            text = event.content.parts[0].text
-            if text and text != "None":
-                final_text = text
+    return result.data
 
-    if not final_text:
-        raise RuntimeError("No final response from agent")
 
-    cleaned = clean_json_fences(final_text)
+async def _record_rollups(
+    user_id: str,
+    period_start: date,
+    weekly_metrics: Optional[Dict[str, Any]],
+    data: Dict[str, Any],
+) -> None:
+    """Feed the finished report into the team/org rollups without failing the run."""
+    weekly_report = data.get("weekly_report")
+    if not isinstance(weekly_report, dict):
+        return
 
     try:
-        data = json.loads(cleaned)
-    except json.JSONDecodeError as e:
-        raise RuntimeError(f"Agent returned invalid JSON: {e}") from e
-
-    return data
+        await asyncio.to_thread(
+            rollup_engine.record,
+            {**weekly_report, "user_id": user_id, "period_start": period_start.isoformat()},
+            weekly_metrics,
+        )
+    except Exception:
+        logger.exception("Could not update rollups for user %s", user_id)
 
 
 async def _demo() -> None:
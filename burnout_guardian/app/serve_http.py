@@ -1,10 +1,21 @@
+import asyncio
+import json
 from datetime import date
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
-from burnout_guardian.app.run_weekly_report import run_weekly_report
+from burnout_guardian.app.pipeline import stage_retry_counters
+from burnout_guardian.app.run_weekly_report import new_session_id, run_weekly_report
+from burnout_guardian.ingestion import week_ingestor
+from burnout_guardian.model_client import model_client_stats
+from burnout_guardian.rollups import rollup_engine
+from burnout_guardian.tools.team_tool import get_team_members
+
+
+MAX_BATCH_CONCURRENCY = 32
 
 
 app = FastAPI(
@@ -21,6 +32,27 @@ class WeeklyReportRequest(BaseModel):
     session_id: Optional[str] = None
 
 
+class WeeklyReportBatchRequest(BaseModel):
+    user_ids: Optional[List[str]] = None
+    team_id: Optional[str] = None
+    period_start: date
+    period_end: date
+    max_concurrency: int = Field(default=8, ge=1, le=MAX_BATCH_CONCURRENCY)
+
+
+class IngestDelta(BaseModel):
+    op: str
+    kind: str
+    id: Optional[str] = None
+    date: Optional[str] = None
+    data: Optional[Dict[str, Any]] = None
+
+
+class IngestRequest(BaseModel):
+    week_start: date
+    deltas: List[IngestDelta]
+
+
 @app.post("/weekly-report")
 async def weekly_report_endpoint(req: WeeklyReportRequest):
     """
@@ -38,7 +70,7 @@ async def weekly_report_endpoint(req: WeeklyReportRequest):
             user_id=req.user_id,
             period_start=req.period_start,
             period_end=req.period_end,
-            session_id=req.session_id or "weekly-demo-session",
+            session_id=req.session_id or new_session_id("weekly", req.period_start),
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -52,3 +84,130 @@ async def weekly_report_endpoint(req: WeeklyReportRequest):
 
     return data
 
+
+async def _run_batch(
+    user_ids: List[str],
+    period_start: date,
+    period_end: date,
+    max_concurrency: int,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Run weekly reports with bounded concurrency, yielding results as they complete."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(user_id: str) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                data = await run_weekly_report(
+                    user_id=user_id,
+                    period_start=period_start,
+                    period_end=period_end,
+                    session_id=new_session_id("batch", period_start),
+                )
+            except Exception as e:
+                return {"user_id": user_id, "status": "error", "error": str(e)}
+
+        weekly_report = data.get("weekly_report")
+        if not isinstance(weekly_report, dict):
+            return {
+                "user_id": user_id,
+                "status": "error",
+                "error": "Missing or invalid 'weekly_report' object in agent response",
+            }
+        return {"user_id": user_id, "status": "ok", "weekly_report": weekly_report}
+
+    tasks = [asyncio.create_task(run_one(user_id)) for user_id in user_ids]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # The client may disconnect mid-stream: do not leave orphan pipelines running.
+        for task in tasks:
+            task.cancel()
+
+
+async def _ndjson_lines(results: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    succeeded = failed = 0
+    async for result in results:
+        if result["status"] == "ok":
+            succeeded += 1
+        else:
+            failed += 1
+        yield json.dumps(result) + "\n"
+
+    summary = {"total": succeeded + failed, "succeeded": succeeded, "failed": failed}
+    yield json.dumps({"batch_summary": summary}) + "\n"
+
+
+@app.post("/weekly-reports:batch")
+async def weekly_reports_batch_endpoint(req: WeeklyReportBatchRequest):
+    """
+    Run weekly burnout checks for a list of users (or a whole team).
+
+    Streams NDJSON: one line per user in completion order, with
+    status "ok" (and the weekly_report) or "error" (and the reason),
+    followed by a final batch_summary line.
+    """
+    if (req.user_ids is None) == (req.team_id is None):
+        raise HTTPException(status_code=422, detail="Provide exactly one of user_ids or team_id")
+
+    if req.team_id is not None:
+        user_ids = get_team_members(req.team_id)["members"]
+        if not user_ids:
+            raise HTTPException(status_code=404, detail=f"Unknown team: {req.team_id}")
+    else:
+        user_ids = req.user_ids
+
+    results = _run_batch(
+        user_ids=list(dict.fromkeys(user_ids)),
+        period_start=req.period_start,
+        period_end=req.period_end,
+        max_concurrency=req.max_concurrency,
+    )
+    return StreamingResponse(_ndjson_lines(results), media_type="application/x-ndjson")
+
+
+@app.get("/rollups/heatmap")
+async def rollups_heatmap_endpoint(week_start: date):
+    """Precomputed risk rollup of every team for the given week."""
+    return {"week_start": week_start.isoformat(), "teams": rollup_engine.team_heatmap(week_start)}
+
+
+@app.get("/rollups/{scope}/{scope_id}")
+async def rollup_endpoint(scope: str, scope_id: str, week_start: date):
+    """
+    Precomputed risk rollup of a team, department or the whole org ("org/all").
+
+    Includes the risk_level distribution, median hours, late-evening rates
+    and week-over-week deltas.
+    """
+    if scope not in ("team", "department", "org"):
+        raise HTTPException(status_code=404, detail=f"Unknown rollup scope: {scope}")
+    return rollup_engine.get(scope, scope_id, week_start)
+
+
+@app.post("/ingest/{user_id}")
+async def ingest_endpoint(user_id: str, req: IngestRequest):
+    """
+    Apply calendar/worklog deltas to the user's running week.
+
+    Each delta is {"op": "append|update|delete", "kind": "event|workday|checkin",
+    "id"/"date": ..., "data": {...}}. Returns the updated weekly_metrics and the
+    profile limits crossed by these deltas (e.g. max_late_evenings_per_week).
+    """
+    deltas = [delta.model_dump(exclude_none=True) for delta in req.deltas]
+    try:
+        return await asyncio.to_thread(week_ingestor.ingest, user_id, req.week_start, deltas)
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid delta: {e}")
+
+
+@app.get("/pipeline-stats")
+async def pipeline_stats_endpoint():
+    """Per-stage run, attempt, retry and failure counters of this worker."""
+    return stage_retry_counters()
+
+
+@app.get("/model-stats")
+async def model_stats_endpoint():
+    """Per-stage model call, hedge and timeout counters and latencies of this worker."""
+    return model_client_stats()
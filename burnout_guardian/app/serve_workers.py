@@ -0,0 +1,55 @@
+import argparse
+import os
+from typing import List, Optional
+
+import uvicorn
+
+from burnout_guardian.state_store import STATE_DB_ENV, prepare_state_db
+
+
+DEFAULT_STATE_DB = "burnout_guardian_state.db"
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Serve the Burnout Guardian HTTP API with several worker processes.",
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes (default: one per CPU core).",
+    )
+    parser.add_argument(
+        "--state-db",
+        default=os.environ.get(STATE_DB_ENV, DEFAULT_STATE_DB),
+        help="SQLite file shared by all workers for sessions and memory.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Start N uvicorn workers that share sessions and memory through SQLite.
+
+    The database (in WAL mode) and its session tables are created once in the
+    parent, and its path is exported through the environment so every worker
+    builds the same services.
+    """
+    args = parse_args(argv)
+
+    state_db = os.path.abspath(args.state_db)
+    prepare_state_db(state_db)
+    os.environ[STATE_DB_ENV] = state_db
+
+    uvicorn.run(
+        "burnout_guardian.app.serve_http:app",
+        host=args.host,
+        port=args.port,
+        workers=max(1, args.workers),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from burnout_guardian.metrics import combine_days, day_metrics, threshold_breaches
+from burnout_guardian.normalize import (
+    merge_workdays,
+    normalize_events,
+    normalize_workdays,
+    source_timezones,
+)
+from burnout_guardian.state_store import build_kv_store
+from burnout_guardian.tools.profile_tool import get_profile_and_history
+
+
+RUNNING_WEEKS_NAMESPACE = "running_weeks"
+
+DELTA_OPS = ("append", "update", "delete")
+DELTA_KINDS = ("event", "workday", "checkin")
+
+
+def _empty_week(user_id: str, week_start: date) -> Dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "week_start": week_start.isoformat(),
+        "events": {},
+        "event_days": {},
+        "day_events": {},
+        "workdays": {},
+        "workday_days": {},
+        "day_workdays": {},
+        "days": {},
+        "checkin": None,
+        "breaches": {},
+    }
+
+
+def _apply_delta(
+    week: Dict[str, Any],
+    delta: Dict[str, Any],
+    week_days: List[str],
+    tz_name: Optional[str],
+    source_tzs: Tuple[Optional[str], Optional[str]] = (None, None),
+) -> List[str]:
+    """Apply one delta to the running week and return the days it touched.
+
+    source_tzs are the (calendar, work log) timezones of naive source times.
+    """
+    op, kind = delta.get("op"), delta.get("kind")
+    if op not in DELTA_OPS:
+        raise ValueError(f"Unknown delta op: {op!r}")
+    if kind not in DELTA_KINDS:
+        raise ValueError(f"Unknown delta kind: {kind!r}")
+    data = delta.get("data") or {}
+
+    if kind == "checkin":
+        week["checkin"] = None if op == "delete" else data
+        return []
+
+    if kind == "workday":
+        return _apply_workday_delta(week, op, delta, data, week_days, tz_name, source_tzs[1])
+
+    event_id = delta.get("id") or data.get("id")
+    if not event_id:
+        raise ValueError("Event deltas need an id")
+
+    # An event crossing local midnight is stored as one piece per day.
+    touched = week["event_days"].pop(event_id, [])
+    week["events"].pop(event_id, None)
+    for day in touched:
+        week["day_events"][day].remove(event_id)
+
+    if op != "delete":
+        event = {**data, "id": event_id}
+        pieces = (
+            normalize_events([event], tz_name, assume_timezone=source_tzs[0])
+            if tz_name
+            else [event]
+        )
+        days = [piece["start_time"][:10] for piece in pieces]
+        if any(day not in week_days for day in days):
+            raise ValueError(f"Event {event_id!r} is outside the week")
+        week["events"][event_id] = pieces
+        week["event_days"][event_id] = days
+        for day in days:
+            week["day_events"].setdefault(day, []).append(event_id)
+        touched = touched + days
+    return touched
+
+
+def _apply_workday_delta(
+    week: Dict[str, Any],
+    op: str,
+    delta: Dict[str, Any],
+    data: Dict[str, Any],
+    week_days: List[str],
+    tz_name: Optional[str],
+    source_tz: Optional[str],
+) -> List[str]:
+    """Apply one work log delta, keyed by the source date of the entry."""
+    source_day = delta.get("date") or data.get("date")
+    if not source_day:
+        raise ValueError("Workday deltas need a date")
+    if op == "delete" and source_day not in week_days and source_day not in week["workday_days"]:
+        raise ValueError(f"Workday {source_day!r} is outside the week")
+
+    # In local time an entry can span two days; it is stored as one piece per
+    # day, and each day merges the pieces of every entry that reaches it.
+    touched = week["workday_days"].pop(source_day, [])
+    week["workdays"].pop(source_day, None)
+    for day in touched:
+        week["day_workdays"][day].remove(source_day)
+
+    if op != "delete":
+        workday = {**data, "date": source_day}
+        pieces = (
+            normalize_workdays([workday], tz_name, assume_timezone=source_tz)
+            if tz_name
+            else [workday]
+        )
+        days = [piece["date"] for piece in pieces]
+        if any(day not in week_days for day in days):
+            raise ValueError(f"Workday {source_day!r} is outside the week")
+        week["workdays"][source_day] = pieces
+        week["workday_days"][source_day] = days
+        for day in days:
+            week["day_workdays"].setdefault(day, []).append(source_day)
+        touched = touched + days
+    return touched
+
+
+class WeekIngestor:
+    """Keeps the running week of each user up to date from calendar/worklog deltas.
+
+    Only the days touched by a delta are recomputed (with the same per-day
+    definitions used by weekly_metrics), and the week totals are folded from
+    at most seven day summaries. Each call reports the profile limits that
+    were crossed by that batch of deltas, so people can be warned mid-week.
+    """
+
+    def __init__(self, store):
+        self._store = store
+
+    def ingest(
+        self,
+        user_id: str,
+        week_start: date,
+        deltas: List[Dict[str, Any]],
+        user_profile: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        if user_profile is None:
+            user_profile = get_profile_and_history(user_id)["user_profile"]
+        preferred_end = user_profile["preferred_work_hours"]["end"]
+        tz_name = user_profile.get("timezone")
+        source_tzs = source_timezones(user_profile)
+
+        week_days = [(week_start + timedelta(days=n)).isoformat() for n in range(7)]
+        key = f"{user_id}:{week_start.isoformat()}"
+        result: Dict[str, Any] = {}
+
+        def apply(current: Dict[str, Optional[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+            week = current[key] or _empty_week(user_id, week_start)
+
+            touched = set()
+            for delta in deltas:
+                touched.update(_apply_delta(week, delta, week_days, tz_name, source_tzs))
+
+            for day in touched:
+                day_events = [
+                    piece
+                    for event_id in week["day_events"].get(day, [])
+                    for piece in week["events"][event_id]
+                    if piece["start_time"][:10] == day
+                ]
+                day_workdays = merge_workdays(
+                    [
+                        piece
+                        for source_day in week["day_workdays"].get(day, [])
+                        for piece in week["workdays"][source_day]
+                        if piece["date"] == day
+                    ]
+                )
+                week["days"][day] = day_metrics(
+                    day, day_events, day_workdays[0] if day_workdays else None, preferred_end
+                )
+
+            weekly_metrics = combine_days(
+                user_id=user_id,
+                period_start=week_days[0],
+                period_end=week_days[-1],
+                days=week["days"],
+                checkin=week["checkin"],
+            )
+            breaches = threshold_breaches(weekly_metrics, user_profile)
+            crossed = {
+                name: breach for name, breach in breaches.items() if name not in week["breaches"]
+            }
+            week["breaches"] = breaches
+
+            result["weekly_metrics"] = weekly_metrics
+            result["threshold_crossings"] = [
+                {"threshold": name, **breach} for name, breach in crossed.items()
+            ]
+            return {key: week}
+
+        self._store.transact(RUNNING_WEEKS_NAMESPACE, [key], apply)
+        return result
+
+
+week_ingestor = WeekIngestor(build_kv_store())
@@ -0,0 +1,172 @@
+from datetime import date, datetime, time
+from typing import Any, Dict, List, Optional
+
+from burnout_guardian.normalize import normalize_week, source_timezones
+
+
+# A pause shorter than this does not count as a real break.
+MIN_REAL_BREAK_MINUTES = 30
+
+
+def _hours(start: datetime, end: datetime) -> float:
+    return max((end - start).total_seconds(), 0.0) / 3600
+
+
+def day_metrics(
+    day: str,
+    events: List[Dict[str, Any]],
+    workday: Optional[Dict[str, Any]],
+    preferred_end: str,
+) -> Dict[str, Any]:
+    """Metrics of a single day, the building block of weekly_metrics.
+
+    Args:
+        day: The day in ISO format "YYYY-MM-DD".
+        events: Calendar events starting on that day (id, start_time, end_time, type).
+        workday: The work log entry for that day, if any
+            (first_activity_time / last_activity_time as "HH:MM").
+        preferred_end: The user's normal end of day, "HH:MM".
+
+    Returns:
+        A dictionary with:
+          - worked: whether there was any work activity
+          - hours: hours between the first and last activity, minus breaks
+          - meeting_hours / num_meetings
+          - late_evening: work ended after preferred_end
+          - weekend: the day is a Saturday or Sunday
+          - real_break: at least one break of MIN_REAL_BREAK_MINUTES
+    """
+    day_date = date.fromisoformat(day)
+    starts: List[datetime] = []
+    ends: List[datetime] = []
+    meeting_hours = 0.0
+    num_meetings = 0
+    break_hours = 0.0
+    real_break = False
+
+    for event in events:
+        start = datetime.fromisoformat(event["start_time"])
+        end = datetime.fromisoformat(event["end_time"])
+        if event.get("type") == "break":
+            break_hours += _hours(start, end)
+            real_break = real_break or _hours(start, end) * 60 >= MIN_REAL_BREAK_MINUTES
+            continue
+        starts.append(start)
+        ends.append(end)
+        if event.get("type") == "meeting":
+            meeting_hours += _hours(start, end)
+            num_meetings += 1
+
+    if workday:
+        first = time.fromisoformat(workday["first_activity_time"])
+        last = time.fromisoformat(workday["last_activity_time"])
+        starts.append(datetime.combine(day_date, first))
+        ends.append(datetime.combine(day_date, last))
+
+    worked = bool(starts)
+    hours = max(_hours(min(starts), max(ends)) - break_hours, 0.0) if worked else 0.0
+    day_end = datetime.combine(day_date, time.fromisoformat(preferred_end))
+    late_evening = worked and max(ends) > day_end
+
+    return {
+        "worked": worked,
+        "hours": round(hours, 2),
+        "meeting_hours": round(meeting_hours, 2),
+        "num_meetings": num_meetings,
+        "late_evening": late_evening,
+        "weekend": day_date.weekday() >= 5,
+        "real_break": real_break,
+    }
+
+
+def combine_days(
+    user_id: str,
+    period_start: str,
+    period_end: str,
+    days: Dict[str, Dict[str, Any]],
+    checkin: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Fold per-day metrics into the weekly_metrics shape used by the agents."""
+    worked = [metrics for metrics in days.values() if metrics["worked"]]
+    total_hours = sum(metrics["hours"] for metrics in worked)
+    checkin = checkin or {}
+
+    return {
+        "user_id": user_id,
+        "period_start": period_start,
+        "period_end": period_end,
+        "total_hours": round(total_hours, 2),
+        "avg_hours_per_day": round(total_hours / len(worked), 2) if worked else 0.0,
+        "late_evenings": sum(1 for metrics in worked if metrics["late_evening"]),
+        "weekend_days_worked": sum(1 for metrics in worked if metrics["weekend"]),
+        "meeting_hours": round(sum(metrics["meeting_hours"] for metrics in worked), 2),
+        "num_meetings": sum(metrics["num_meetings"] for metrics in worked),
+        "days_without_real_breaks": sum(1 for metrics in worked if not metrics["real_break"]),
+        "checkin_energy": checkin.get("energy_level"),
+        "checkin_stress": checkin.get("stress_level"),
+    }
+
+
+def weekly_metrics_from_snapshot(
+    week_snapshot: Dict[str, Any],
+    user_profile: Dict[str, Any],
+    from_sources: bool = False,
+) -> Dict[str, Any]:
+    """Compute weekly_metrics for a whole week_snapshot in one pass.
+
+    Events and workdays are first moved to the user's local time (profile
+    timezone), so late evenings and weekend days use the person's own clock.
+    A snapshot built by the tools already has naive local times; pass
+    from_sources=True for raw source data, whose naive times are then read
+    in the profile's calendar / work log timezones.
+    """
+    if user_profile.get("timezone"):
+        calendar_tz, worklog_tz = source_timezones(user_profile) if from_sources else (None, None)
+        week_snapshot = normalize_week(
+            week_snapshot, user_profile["timezone"], calendar_tz, worklog_tz
+        )
+
+    events_by_day: Dict[str, List[Dict[str, Any]]] = {}
+    for event in week_snapshot.get("calendar_events", []):
+        events_by_day.setdefault(event["start_time"][:10], []).append(event)
+    workdays = {workday["date"]: workday for workday in week_snapshot.get("workdays", [])}
+
+    preferred_end = user_profile["preferred_work_hours"]["end"]
+    days = {
+        day: day_metrics(day, events_by_day.get(day, []), workdays.get(day), preferred_end)
+        for day in sorted(set(events_by_day) | set(workdays))
+    }
+    return combine_days(
+        user_id=week_snapshot["user_id"],
+        period_start=week_snapshot["period_start"],
+        period_end=week_snapshot["period_end"],
+        days=days,
+        checkin=week_snapshot.get("weekly_checkin"),
+    )
+
+
+def threshold_breaches(
+    weekly_metrics: Dict[str, Any],
+    user_profile: Dict[str, Any],
+) -> Dict[str, Dict[str, Any]]:
+    """Return the profile limits that the metrics currently exceed, keyed by limit name."""
+    breaches: Dict[str, Dict[str, Any]] = {}
+
+    limit = user_profile.get("max_late_evenings_per_week")
+    if limit is not None and weekly_metrics["late_evenings"] > limit:
+        breaches["max_late_evenings_per_week"] = {
+            "limit": limit,
+            "value": weekly_metrics["late_evenings"],
+        }
+
+    limit = user_profile.get("max_hours_per_week")
+    if limit is not None and weekly_metrics["total_hours"] > limit:
+        breaches["max_hours_per_week"] = {"limit": limit, "value": weekly_metrics["total_hours"]}
+
+    if not user_profile.get("allow_weekend_work", True) and weekly_metrics["weekend_days_worked"]:
+        breaches["allow_weekend_work"] = {
+            "limit": False,
+            "value": weekly_metrics["weekend_days_worked"],
+        }
+
+    return breaches
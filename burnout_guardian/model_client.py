@@ -0,0 +1,318 @@
+import asyncio
+import math
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+import httpx
+from google.adk.models import Gemini
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import Client, types
+from pydantic import ConfigDict, Field
+
+
+T = TypeVar("T")
+
+# Environment variables read by ModelClientConfig.from_env().
+MODEL_BASE_URL_ENV = "BURNOUT_GUARDIAN_MODEL_BASE_URL"
+MODEL_TIMEOUTS_ENV = "BURNOUT_GUARDIAN_MODEL_TIMEOUTS"
+HEDGE_PERCENTILE_ENV = "BURNOUT_GUARDIAN_HEDGE_PERCENTILE"
+MODEL_MAX_CONNECTIONS_ENV = "BURNOUT_GUARDIAN_MODEL_MAX_CONNECTIONS"
+
+# Seconds allowed for one model call of each stage (hedges included).
+DEFAULT_STAGE_TIMEOUTS_S = {
+    "data_collector": 30.0,
+    "risk_scorer": 20.0,
+    "wellbeing_coach": 45.0,
+}
+DEFAULT_TIMEOUT_S = 30.0
+
+# Hedging starts only once a stage has this many latency samples.
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+
+
+@dataclass
+class ModelClientConfig:
+    """How the agents talk to the model API.
+
+    Attributes:
+        base_url: Optional API endpoint, e.g. a local stub server in tests.
+        api_key: Optional API key (otherwise read by google-genai from the environment).
+        stage_timeouts_s: Seconds allowed per model call, keyed by stage (agent) name.
+        default_timeout_s: Timeout of stages not listed in stage_timeouts_s.
+        hedge_percentile: When set (e.g. 95), a duplicate request is sent once a call
+            runs longer than this latency percentile of the stage; None disables hedging.
+        hedge_min_samples: Calls a stage must have made before it can be hedged.
+        max_connections: Size of the shared HTTP connection pool.
+        max_keepalive_connections: Idle connections kept open for reuse.
+        keepalive_expiry_s: Seconds an idle connection stays in the pool.
+    """
+
+    base_url: Optional[str] = None
+    api_key: Optional[str] = None
+    stage_timeouts_s: Dict[str, float] = field(
+        default_factory=lambda: dict(DEFAULT_STAGE_TIMEOUTS_S)
+    )
+    default_timeout_s: float = DEFAULT_TIMEOUT_S
+    hedge_percentile: Optional[float] = None
+    hedge_min_samples: int = HEDGE_MIN_SAMPLES
+    max_connections: int = 32
+    max_keepalive_connections: int = 16
+    keepalive_expiry_s: float = 60.0
+
+    @classmethod
+    def from_env(cls) -> "ModelClientConfig":
+        """Build the configuration from BURNOUT_GUARDIAN_MODEL_* / HEDGE_* variables.
+
+        MODEL_TIMEOUTS is a comma-separated list such as "risk_scorer=20,default=30".
+        """
+        config = cls(base_url=os.environ.get(MODEL_BASE_URL_ENV) or None)
+        for item in filter(None, os.environ.get(MODEL_TIMEOUTS_ENV, "").split(",")):
+            stage, _, seconds = item.partition("=")
+            if stage.strip() == "default":
+                config.default_timeout_s = float(seconds)
+            else:
+                config.stage_timeouts_s[stage.strip()] = float(seconds)
+        if os.environ.get(HEDGE_PERCENTILE_ENV):
+            config.hedge_percentile = float(os.environ[HEDGE_PERCENTILE_ENV])
+        if os.environ.get(MODEL_MAX_CONNECTIONS_ENV):
+            config.max_connections = int(os.environ[MODEL_MAX_CONNECTIONS_ENV])
+            config.max_keepalive_connections = min(
+                config.max_keepalive_connections, config.max_connections
+            )
+        return config
+
+    def timeout_for(self, stage: str) -> float:
+        return self.stage_timeouts_s.get(stage, self.default_timeout_s)
+
+
+class ModelTimeoutError(asyncio.TimeoutError):
+    """A model call ran past the timeout of its stage."""
+
+    def __init__(self, stage: str, timeout_s: float):
+        self.stage = stage
+        self.timeout_s = timeout_s
+        super().__init__(f"Model call of stage {stage} timed out after {timeout_s:g}s")
+
+
+class LatencyTracker:
+    """Rolling window of the latest call latencies of one stage."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, latency_s: float) -> None:
+        self._samples.append(latency_s)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Nearest-rank percentile of the window, or None when it is empty."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+        return ordered[min(rank, len(ordered)) - 1]
+
+
+async def hedged_call(
+    make_call: Callable[[], Awaitable[T]],
+    hedge_after_s: Optional[float],
+) -> T:
+    """Await make_call(), sending a duplicate if it is slower than hedge_after_s.
+
+    The first call to succeed wins and the other one is cancelled. If one of
+    them fails, the other is still awaited; the error is raised only when
+    both fail. With hedge_after_s None this is a plain await.
+    """
+    first = asyncio.ensure_future(make_call())
+    pending = {first}
+    error: Optional[BaseException] = None
+    try:
+        if hedge_after_s is None:
+            return await first
+
+        done, _ = await asyncio.wait(pending, timeout=hedge_after_s)
+        if not done:
+            pending.add(asyncio.ensure_future(make_call()))
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = error or task.exception()
+        raise error
+    finally:
+        # Also reached when the caller is cancelled (stage timeout, client gone).
+        for task in pending:
+            task.cancel()
+
+
+class SharedModelClient:
+    """One connection pool, timeout policy and latency history for all agents.
+
+    google-genai clients hold sockets bound to the event loop that opened
+    them, so one client is built per running loop and shared by every model
+    using this object; within a loop all agents reuse the same keep-alive
+    connections.
+    """
+
+    def __init__(self, config: Optional[ModelClientConfig] = None):
+        self.config = config or ModelClientConfig.from_env()
+        self._clients: "weakref.WeakKeyDictionary[Any, Client]" = weakref.WeakKeyDictionary()
+        self._offloop_client: Optional[Client] = None
+        self._lock = threading.Lock()
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _build_client(self) -> Client:
+        limits = httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive_connections,
+            keepalive_expiry=self.config.keepalive_expiry_s,
+        )
+        http_options = types.HttpOptions(
+            base_url=self.config.base_url,
+            client_args={"limits": limits},
+            async_client_args={"limits": limits},
+        )
+        return Client(api_key=self.config.api_key, http_options=http_options)
+
+    @property
+    def api_client(self) -> Client:
+        """The google-genai client of the running event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self._lock:
+            if loop is None:
+                if self._offloop_client is None:
+                    self._offloop_client = self._build_client()
+                return self._offloop_client
+            client = self._clients.get(loop)
+            if client is None:
+                client = self._clients[loop] = self._build_client()
+            return client
+
+    def tracker(self, stage: str) -> LatencyTracker:
+        with self._lock:
+            return self._trackers.setdefault(stage, LatencyTracker())
+
+    def hedge_after_s(self, stage: str) -> Optional[float]:
+        """Latency after which a call of this stage is hedged, if hedging applies."""
+        tracker = self.tracker(stage)
+        if self.config.hedge_percentile is None or len(tracker) < self.config.hedge_min_samples:
+            return None
+        return tracker.percentile(self.config.hedge_percentile)
+
+    def count(self, stage: str, name: str) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(
+                stage, {"calls": 0, "hedged": 0, "hedge_wins": 0, "timeouts": 0}
+            )
+            counters[name] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage call, hedge and timeout counters with p50/p99 latencies."""
+        snapshot = {}
+        with self._lock:
+            stages = sorted(set(self._counters) | set(self._trackers))
+            for stage in stages:
+                tracker = self._trackers.get(stage, LatencyTracker())
+                snapshot[stage] = {
+                    **self._counters.get(stage, {}),
+                    "p50_s": tracker.percentile(50),
+                    "p99_s": tracker.percentile(99),
+                }
+        return snapshot
+
+
+class PooledGemini(Gemini):
+    """Gemini model of one pipeline stage, going through a SharedModelClient.
+
+    Non-streaming calls are bounded by the stage timeout (ModelTimeoutError)
+    and hedged once they run past the configured latency percentile;
+    streaming calls only share the connection pool.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    stage: str
+    shared_client: SharedModelClient = Field(exclude=True)
+
+    @property
+    def api_client(self) -> Client:
+        return self.shared_client.api_client
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if stream:
+            async for response in super().generate_content_async(llm_request, stream=True):
+                yield response
+            return
+
+        shared = self.shared_client
+        hedge_after_s = shared.hedge_after_s(self.stage)
+        # The request is mutated while it is sent, so a hedge gets a pristine copy.
+        spare = llm_request.model_copy(deep=True) if hedge_after_s is not None else None
+        attempts = 0
+
+        async def call_once():
+            nonlocal attempts
+            attempts += 1
+            attempt = attempts
+            request = llm_request if attempt == 1 else spare
+            responses = [
+                response
+                async for response in Gemini.generate_content_async(self, request, stream=False)
+            ]
+            return responses, attempt
+
+        # Latency is measured from the start of the call, so a hedged call
+        # counts the wait before its hedge and the slow tail stays visible.
+        shared.count(self.stage, "calls")
+        timeout_s = shared.config.timeout_for(self.stage)
+        started = time.perf_counter()
+        try:
+            responses, attempt = await asyncio.wait_for(
+                hedged_call(call_once, hedge_after_s), timeout=timeout_s
+            )
+        except asyncio.TimeoutError as e:
+            shared.count(self.stage, "timeouts")
+            shared.tracker(self.stage).record(time.perf_counter() - started)
+            raise ModelTimeoutError(self.stage, timeout_s) from e
+        finally:
+            if attempts > 1:
+                shared.count(self.stage, "hedged")
+
+        shared.tracker(self.stage).record(time.perf_counter() - started)
+        if attempt > 1:
+            shared.count(self.stage, "hedge_wins")
+        for response in responses:
+            yield response
+
+
+shared_model_client = SharedModelClient()
+
+
+def build_model(
+    stage: str, model: str, shared_client: Optional[SharedModelClient] = None
+) -> Gemini:
+    """The model object an agent of the given stage should use."""
+    return PooledGemini(
+        model=model, stage=stage, shared_client=shared_client or shared_model_client
+    )
+
+
+def model_client_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-stage model call counters of this worker."""
+    return shared_model_client.stats()
@@ -0,0 +1,174 @@
+from datetime import datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+
+# UTC offset changes always happen on a quarter-hour boundary, so one lookup
+# per 15-minute UTC bucket is enough for a whole batch of events.
+_OFFSET_BUCKET_S = 15 * 60
+
+
+class LocalClock:
+    """Converts timestamps to one person's local wall-clock time.
+
+    Timezone-aware timestamps are converted. Naive timestamps are assumed to
+    be in `assume_timezone` if given, otherwise they are taken as already
+    local (which is what the built-in tools return).
+    """
+
+    def __init__(self, tz_name: str, assume_timezone: Optional[str] = None):
+        self._tz = ZoneInfo(tz_name)
+        self._assume = ZoneInfo(assume_timezone) if assume_timezone else None
+        self._offsets: Dict[int, timedelta] = {}
+
+    def to_local(self, value: datetime) -> datetime:
+        """Return the naive local datetime for `value`."""
+        if value.tzinfo is None:
+            if self._assume is None:
+                return value
+            value = value.replace(tzinfo=self._assume)
+
+        utc = value.astimezone(timezone.utc)
+        bucket = int(utc.timestamp()) // _OFFSET_BUCKET_S
+        offset = self._offsets.get(bucket)
+        if offset is None:
+            offset = self._offsets[bucket] = utc.astimezone(self._tz).utcoffset()
+        return (utc + offset).replace(tzinfo=None)
+
+
+def _split_at_midnight(start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+    """Cut a local interval into one piece per local day (empty pieces are dropped)."""
+    pieces = []
+    while start.date() < end.date():
+        midnight = datetime.combine(start.date() + timedelta(days=1), time())
+        if midnight > start:
+            pieces.append((start, midnight))
+        start = midnight
+    if end > start or not pieces:
+        pieces.append((start, end))
+    return pieces
+
+
+def normalize_events(
+    events: List[Dict[str, Any]],
+    tz_name: str,
+    assume_timezone: Optional[str] = None,
+    clock: Optional[LocalClock] = None,
+) -> List[Dict[str, Any]]:
+    """Convert calendar events to local time and split those crossing midnight.
+
+    Returns naive local ISO timestamps, one event per local day. A split
+    event gets one piece per day with id "<id>@<YYYY-MM-DD>" and keeps the
+    original id in "source_id".
+    """
+    clock = clock or LocalClock(tz_name, assume_timezone)
+    normalized = []
+    for event in events:
+        start = clock.to_local(datetime.fromisoformat(event["start_time"]))
+        end = clock.to_local(datetime.fromisoformat(event["end_time"]))
+        pieces = _split_at_midnight(start, end)
+        for piece_start, piece_end in pieces:
+            piece = {
+                **event,
+                "start_time": piece_start.isoformat(timespec="seconds"),
+                "end_time": piece_end.isoformat(timespec="seconds"),
+            }
+            if len(pieces) > 1:
+                piece["id"] = f"{event['id']}@{piece_start.date().isoformat()}"
+                piece["source_id"] = event["id"]
+            normalized.append(piece)
+    return normalized
+
+
+def normalize_workdays(
+    workdays: List[Dict[str, Any]],
+    tz_name: str,
+    assume_timezone: Optional[str] = None,
+    clock: Optional[LocalClock] = None,
+) -> List[Dict[str, Any]]:
+    """Re-bucket work log entries by local day.
+
+    Entries whose activity, once converted, spans two local days are split;
+    entries landing on the same local day are merged (earliest first
+    activity, latest last activity, tasks added up).
+    """
+    clock = clock or LocalClock(tz_name, assume_timezone)
+    entries = []
+    for workday in workdays:
+        day = datetime.fromisoformat(workday["date"]).date()
+        first = time.fromisoformat(workday["first_activity_time"])
+        last = time.fromisoformat(workday["last_activity_time"])
+        first = clock.to_local(datetime.combine(day, first))
+        last = clock.to_local(datetime.combine(day, last))
+
+        for index, (piece_start, piece_end) in enumerate(_split_at_midnight(first, last)):
+            if piece_end.date() > piece_start.date():
+                piece_end = datetime.combine(piece_start.date(), time(23, 59))
+            entries.append(
+                {
+                    "date": piece_start.date().isoformat(),
+                    "first_activity_time": piece_start.strftime("%H:%M"),
+                    "last_activity_time": piece_end.strftime("%H:%M"),
+                    "tasks_completed": workday.get("tasks_completed", 0) if index == 0 else 0,
+                }
+            )
+    return merge_workdays(entries)
+
+
+def merge_workdays(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge work log entries of the same local day, sorted by day.
+
+    The merged entry keeps the earliest first activity, the latest last
+    activity and the sum of the tasks completed.
+    """
+    by_day: Dict[str, Dict[str, Any]] = {}
+    for entry in entries:
+        existing = by_day.get(entry["date"])
+        if existing is None:
+            by_day[entry["date"]] = dict(entry)
+            continue
+        existing["first_activity_time"] = min(
+            existing["first_activity_time"], entry["first_activity_time"]
+        )
+        existing["last_activity_time"] = max(
+            existing["last_activity_time"], entry["last_activity_time"]
+        )
+        existing["tasks_completed"] = existing.get("tasks_completed", 0) + entry.get(
+            "tasks_completed", 0
+        )
+
+    return [by_day[day] for day in sorted(by_day)]
+
+
+def source_timezones(user_profile: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """Timezones of the naive times sent by the calendar and the work log sources.
+
+    Profiles may set "calendar_timezone" and "worklog_timezone" when a source
+    records naive times in a fixed zone (e.g. a tracker logging in "UTC").
+    When unset, naive times from that source are taken as already local.
+    """
+    return user_profile.get("calendar_timezone"), user_profile.get("worklog_timezone")
+
+
+def normalize_week(
+    week_snapshot: Dict[str, Any],
+    tz_name: str,
+    calendar_timezone: Optional[str] = None,
+    worklog_timezone: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Return a copy of a week_snapshot with events and workdays in local time.
+
+    One clock per source is shared by the whole week, so each UTC offset is
+    looked up once per batch instead of once per timestamp.
+    """
+    calendar_clock = LocalClock(tz_name, calendar_timezone)
+    worklog_clock = LocalClock(tz_name, worklog_timezone)
+    return {
+        **week_snapshot,
+        "calendar_events": normalize_events(
+            week_snapshot.get("calendar_events", []), tz_name, clock=calendar_clock
+        ),
+        "workdays": normalize_workdays(
+            week_snapshot.get("workdays", []), tz_name, clock=worklog_clock
+        ),
+    }
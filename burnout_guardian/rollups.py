@@ -0,0 +1,230 @@
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+from burnout_guardian.state_store import build_kv_store
+from burnout_guardian.tools.team_tool import find_user_team, list_teams
+from burnout_guardian.validation import RISK_LEVELS
+
+
+# Weekly hours are summarised with a fixed-width histogram: it is mergeable,
+# has constant size and is precise enough (1h buckets) for a median.
+HOURS_BUCKET_WIDTH = 1.0
+HOURS_BUCKETS = 80  # last bucket also collects everything >= 79h
+
+ROLLUP_NAMESPACE = "rollups"
+
+
+def _hours_bucket(hours: float) -> int:
+    return min(max(int(hours // HOURS_BUCKET_WIDTH), 0), HOURS_BUCKETS - 1)
+
+
+@dataclass
+class RiskRollup:
+    """Mergeable summary of the weekly reports of a group of people."""
+
+    reports: int = 0
+    risk_levels: Dict[str, int] = field(default_factory=lambda: {level: 0 for level in RISK_LEVELS})
+    hours_reports: int = 0
+    hours_sum: float = 0.0
+    hours_histogram: List[int] = field(default_factory=lambda: [0] * HOURS_BUCKETS)
+    late_evenings_sum: int = 0
+    people_with_late_evenings: int = 0
+
+    def add(self, contribution: Dict[str, Any], sign: int = 1) -> None:
+        """Add (sign=1) or remove (sign=-1) one person's week."""
+        self.reports += sign
+        risk_level = contribution.get("risk_level")
+        if risk_level in self.risk_levels:
+            self.risk_levels[risk_level] += sign
+
+        hours = contribution.get("total_hours")
+        if hours is not None:
+            self.hours_reports += sign
+            self.hours_sum += sign * hours
+            self.hours_histogram[_hours_bucket(hours)] += sign
+
+        late_evenings = contribution.get("late_evenings")
+        if late_evenings:
+            self.late_evenings_sum += sign * late_evenings
+            self.people_with_late_evenings += sign
+
+    def merge(self, other: "RiskRollup") -> "RiskRollup":
+        merged = RiskRollup.from_dict(self.to_dict())
+        merged.reports += other.reports
+        for level, count in other.risk_levels.items():
+            merged.risk_levels[level] = merged.risk_levels.get(level, 0) + count
+        merged.hours_reports += other.hours_reports
+        merged.hours_sum += other.hours_sum
+        merged.hours_histogram = [
+            a + b for a, b in zip(merged.hours_histogram, other.hours_histogram)
+        ]
+        merged.late_evenings_sum += other.late_evenings_sum
+        merged.people_with_late_evenings += other.people_with_late_evenings
+        return merged
+
+    def median_hours(self) -> Optional[float]:
+        """Median weekly hours, interpolated inside the histogram bucket."""
+        if self.hours_reports <= 0:
+            return None
+        half = self.hours_reports / 2
+        seen = 0
+        for bucket, count in enumerate(self.hours_histogram):
+            if count and seen + count >= half:
+                return round((bucket + (half - seen) / count) * HOURS_BUCKET_WIDTH, 1)
+            seen += count
+        return None
+
+    def summary(self) -> Dict[str, Any]:
+        reports = max(self.reports, 0)
+        return {
+            "reports": reports,
+            "risk_levels": dict(self.risk_levels),
+            "high_risk_share": round(self.risk_levels["high"] / reports, 3) if reports else None,
+            "median_hours": self.median_hours(),
+            "avg_hours": (
+                round(self.hours_sum / self.hours_reports, 1) if self.hours_reports else None
+            ),
+            "avg_late_evenings": round(self.late_evenings_sum / reports, 2) if reports else None,
+            "late_evening_rate": (
+                round(self.people_with_late_evenings / reports, 3) if reports else None
+            ),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "reports": self.reports,
+            "risk_levels": dict(self.risk_levels),
+            "hours_reports": self.hours_reports,
+            "hours_sum": self.hours_sum,
+            "hours_histogram": list(self.hours_histogram),
+            "late_evenings_sum": self.late_evenings_sum,
+            "people_with_late_evenings": self.people_with_late_evenings,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "RiskRollup":
+        if not data:
+            return cls()
+        return cls(
+            reports=data["reports"],
+            risk_levels=dict(data["risk_levels"]),
+            hours_reports=data["hours_reports"],
+            hours_sum=data["hours_sum"],
+            hours_histogram=list(data["hours_histogram"]),
+            late_evenings_sum=data["late_evenings_sum"],
+            people_with_late_evenings=data["people_with_late_evenings"],
+        )
+
+
+class _StaleContribution(Exception):
+    pass
+
+
+def _rollup_key(scope: str, scope_id: str, week_start: str) -> str:
+    return f"{scope}:{scope_id}:{week_start}"
+
+
+def _delta(current: Optional[float], previous: Optional[float]) -> Optional[float]:
+    if current is None or previous is None:
+        return None
+    return round(current - previous, 3)
+
+
+class RollupEngine:
+    """Keeps team / department / org rollups up to date as reports are produced.
+
+    Every report updates a handful of precomputed rollups, so reading a team or
+    org view is a couple of key lookups regardless of how many people it covers.
+    Re-running a report for the same user and week replaces its contribution.
+    """
+
+    def __init__(self, store):
+        self._store = store
+
+    def record(
+        self,
+        weekly_report: Dict[str, Any],
+        weekly_metrics: Optional[Dict[str, Any]] = None,
+        team: Optional[Dict[str, str]] = None,
+    ) -> None:
+        user_id = weekly_report["user_id"]
+        week_start = weekly_report["period_start"]
+        metrics = weekly_metrics or {}
+        team = team if team is not None else find_user_team(user_id)
+
+        contribution = {
+            "risk_level": weekly_report.get("risk_level"),
+            "total_hours": metrics.get("total_hours"),
+            "late_evenings": metrics.get("late_evenings"),
+            "team": team,
+        }
+
+        def scopes_of(contrib: Dict[str, Any]) -> List[str]:
+            keys = [_rollup_key("org", "all", week_start)]
+            if contrib.get("team"):
+                keys.append(_rollup_key("team", contrib["team"]["team_id"], week_start))
+                keys.append(_rollup_key("department", contrib["team"]["department"], week_start))
+            return keys
+
+        contribution_key = f"contribution:{user_id}:{week_start}"
+
+        def apply(current: Dict[str, Optional[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+            previous = current[contribution_key]
+            previous_scopes = scopes_of(previous or {})
+            if not set(previous_scopes) <= set(current):
+                raise _StaleContribution()
+
+            rollups = {
+                key: RiskRollup.from_dict(current[key])
+                for key in set(scopes_of(contribution)) | set(previous_scopes)
+            }
+            if previous is not None:
+                for key in previous_scopes:
+                    rollups[key].add(previous, sign=-1)
+            for key in scopes_of(contribution):
+                rollups[key].add(contribution)
+
+            updates = {key: rollup.to_dict() for key, rollup in rollups.items()}
+            updates[contribution_key] = contribution
+            return updates
+
+        # The previous contribution may sit in other scopes (the user changed
+        # team), and those keys must be part of the transaction. If it changed
+        # between the lookup and the transaction, look it up again.
+        while True:
+            stored = self._store.get_many(ROLLUP_NAMESPACE, [contribution_key])[contribution_key]
+            keys = [contribution_key, *scopes_of(contribution), *scopes_of(stored or {})]
+            try:
+                self._store.transact(ROLLUP_NAMESPACE, list(dict.fromkeys(keys)), apply)
+                return
+            except _StaleContribution:
+                continue
+
+    def get(self, scope: str, scope_id: str, week_start: date) -> Dict[str, Any]:
+        """Summary of one team/department/org for a week, with week-over-week deltas."""
+        previous_week = week_start - timedelta(days=7)
+        current_key = _rollup_key(scope, scope_id, week_start.isoformat())
+        previous_key = _rollup_key(scope, scope_id, previous_week.isoformat())
+        stored = self._store.get_many(ROLLUP_NAMESPACE, [current_key, previous_key])
+
+        current = RiskRollup.from_dict(stored[current_key]).summary()
+        previous = RiskRollup.from_dict(stored[previous_key]).summary()
+        deltas = {
+            name: _delta(current[name], previous[name])
+            for name in ("high_risk_share", "median_hours", "avg_hours", "late_evening_rate")
+        }
+        return {
+            "scope": scope,
+            "scope_id": scope_id,
+            "week_start": week_start.isoformat(),
+            **current,
+            "week_over_week": deltas,
+        }
+
+    def team_heatmap(self, week_start: date) -> List[Dict[str, Any]]:
+        """One rollup per known team for the given week."""
+        return [self.get("team", team_id, week_start) for team_id in list_teams()]
+
+
+rollup_engine = RollupEngine(build_kv_store())
@@ -0,0 +1,184 @@
+import asyncio
+import copy
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from google.adk.memory import BaseMemoryService
+from google.adk.sessions import BaseSessionService, InMemorySessionService
+
+from burnout_guardian.weekly_memory import WeeklySummaryMemoryService
+
+
+# When this environment variable points to a file, sessions and memory are kept
+# in a shared SQLite database so several worker processes see the same state.
+STATE_DB_ENV = "BURNOUT_GUARDIAN_STATE_DB"
+
+SQLITE_BUSY_TIMEOUT_S = 30.0
+
+
+def connect_state_db(path: str) -> sqlite3.Connection:
+    """Open a connection to the shared state database.
+
+    Every connection waits on locks held by other workers instead of failing
+    immediately, and the database is switched to WAL mode so readers never
+    block the single writer.
+    """
+    conn = sqlite3.connect(path, timeout=SQLITE_BUSY_TIMEOUT_S, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _prepare_state_file(path: str) -> None:
+    """Create the database file (in WAL mode) if it does not exist yet."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    conn = connect_state_db(path)
+    conn.close()
+
+
+def _session_service(path: str):
+    # Needs the optional database extra (google-adk[db]), only import it here.
+    from google.adk.sessions import DatabaseSessionService
+
+    return DatabaseSessionService(
+        db_url=f"sqlite+aiosqlite:///{os.path.abspath(path)}",
+        connect_args={"timeout": SQLITE_BUSY_TIMEOUT_S},
+    )
+
+
+async def _create_session_tables(path: str) -> None:
+    session_service = _session_service(path)
+    try:
+        await session_service.prepare_tables()
+    finally:
+        await session_service.close()
+
+
+def prepare_state_db(path: str) -> None:
+    """Create the state database and its session tables before any worker starts.
+
+    ADK creates its tables on the first session operation; when several
+    workers do that at once on a fresh database they race on the DDL and the
+    schema version row. Doing it once here, in the parent process, means
+    workers always find a complete schema. Must not be called from a running
+    event loop.
+    """
+    _prepare_state_file(path)
+    asyncio.run(_create_session_tables(path))
+
+
+# A transaction reads the current value of some keys (None when missing) and
+# returns the keys to write back.
+Transaction = Callable[[Dict[str, Optional[Dict[str, Any]]]], Dict[str, Dict[str, Any]]]
+
+
+class InMemoryKeyValueStore:
+    """JSON-document store for derived state (rollups, running weeks) in one process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def get_many(self, namespace: str, keys: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        with self._lock:
+            return {key: copy.deepcopy(self._data.get((namespace, key))) for key in keys}
+
+    def transact(
+        self, namespace: str, keys: List[str], fn: Transaction
+    ) -> Dict[str, Dict[str, Any]]:
+        """Atomically read `keys`, apply `fn` and store the values it returns.
+
+        `fn` works on copies, so if it raises nothing is stored.
+        """
+        with self._lock:
+            current = {key: copy.deepcopy(self._data.get((namespace, key))) for key in keys}
+            updates = fn(current)
+            for key, value in updates.items():
+                self._data[(namespace, key)] = copy.deepcopy(value)
+            return updates
+
+
+class SqliteKeyValueStore:
+    """Same interface as InMemoryKeyValueStore, shared by all workers through SQLite."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = connect_state_db(path)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS kv_documents (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+
+    def _read(self, namespace: str, keys: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        current: Dict[str, Optional[Dict[str, Any]]] = {key: None for key in keys}
+        if not keys:
+            return current
+        placeholders = ", ".join("?" for _ in keys)
+        rows = self._conn.execute(
+            f"SELECT key, value FROM kv_documents WHERE namespace = ? AND key IN ({placeholders})",
+            (namespace, *keys),
+        ).fetchall()
+        for key, value in rows:
+            current[key] = json.loads(value)
+        return current
+
+    def get_many(self, namespace: str, keys: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        with self._lock:
+            return self._read(namespace, keys)
+
+    def transact(
+        self, namespace: str, keys: List[str], fn: Transaction
+    ) -> Dict[str, Dict[str, Any]]:
+        """Atomically read `keys`, apply `fn` and store the values it returns.
+
+        BEGIN IMMEDIATE takes the write lock up front, so two workers updating
+        the same document never interleave their read-modify-write.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                updates = fn(self._read(namespace, keys))
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO kv_documents VALUES (?, ?, ?)",
+                    [(namespace, key, json.dumps(value)) for key, value in updates.items()],
+                )
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self._conn.commit()
+            return updates
+
+
+def build_kv_store():
+    """In-memory store by default, SQLite when STATE_DB_ENV is set."""
+    path = os.environ.get(STATE_DB_ENV)
+    if not path:
+        return InMemoryKeyValueStore()
+    _prepare_state_file(path)
+    return SqliteKeyValueStore(path)
+
+
+def build_services() -> Tuple[BaseSessionService, BaseMemoryService]:
+    """Build the session and memory services for this process.
+
+    Without STATE_DB_ENV everything stays in memory (single process). With it,
+    both services share one SQLite database so uvicorn workers stay consistent;
+    call prepare_state_db() once before starting them. Long-term memory keeps one compact summary per user and week either way.
+    """
+    path = os.environ.get(STATE_DB_ENV)
+    if not path:
+        return InMemorySessionService(), WeeklySummaryMemoryService(InMemoryKeyValueStore())
+
+    _prepare_state_file(path)
+    return _session_service(path), WeeklySummaryMemoryService(SqliteKeyValueStore(path))
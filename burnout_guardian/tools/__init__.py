@@ -4,10 +4,14 @@ from burnout_guardian.tools.calendar_tool import get_calendar_events
 from burnout_guardian.tools.worklog_tool import get_workdays
 from burnout_guardian.tools.checkins_tool import get_weekly_checkin
 from burnout_guardian.tools.profile_tool import get_profile_and_history
+from burnout_guardian.tools.team_tool import get_team_members, find_user_team, list_teams
 
 __all__ = [
     "get_calendar_events",
     "get_workdays",
     "get_weekly_checkin",
     "get_profile_and_history",
+    "get_team_members",
+    "find_user_team",
+    "list_teams",
 ]
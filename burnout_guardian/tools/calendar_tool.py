@@ -1,6 +1,10 @@
 from datetime import datetime
 from typing import Dict, List, Any
 
+from burnout_guardian.normalize import normalize_events, source_timezones
+from burnout_guardian.tools.fixtures import get_week_fixture
+from burnout_guardian.tools.profile_tool import get_profile_and_history
+
 
 def get_calendar_events(user_id: str, start: str, end: str) -> Dict[str, List[Dict[str, Any]]]:
     """Return a simple list of calendar events for the given user and date range.
@@ -17,11 +21,17 @@ def get_calendar_events(user_id: str, start: str, end: str) -> Dict[str, List[Di
           - start_time: ISO string
           - end_time: ISO string
           - type: "meeting" | "focus" | "work" | "break" | "other"
+        Times are in the user's local time (profile timezone); events crossing
+        midnight are split into one event per day.
     """
     # For now this is a fake data source with a few hard-coded events.
     start_dt = datetime.fromisoformat(start)
     week_start = start_dt.date().isoformat()
 
+    fixture = get_week_fixture(user_id, week_start)
+    if fixture is not None:
+        return {"events": _local_events(user_id, fixture.get("calendar_events", []), start, end)}
+
     events = [
         {
             "id": f"{user_id}-mon-morning-meeting",
@@ -43,4 +53,18 @@ def get_calendar_events(user_id: str, start: str, end: str) -> Dict[str, List[Di
         },
     ]
 
-    return {"events": events}
+    return {"events": _local_events(user_id, events, start, end)}
+
+
+def _local_events(
+    user_id: str,
+    events: List[Dict[str, Any]],
+    start: str,
+    end: str,
+) -> List[Dict[str, Any]]:
+    user_profile = get_profile_and_history(user_id)["user_profile"]
+    tz_name = user_profile.get("timezone")
+    if tz_name:
+        calendar_tz, _ = source_timezones(user_profile)
+        events = normalize_events(events, tz_name, assume_timezone=calendar_tz)
+    return [event for event in events if start <= event["start_time"] <= end]
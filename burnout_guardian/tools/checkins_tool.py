@@ -1,6 +1,8 @@
 from datetime import date
 from typing import Dict, Any
 
+from burnout_guardian.tools.fixtures import get_week_fixture
+
 
 def get_weekly_checkin(user_id: str, week_start: str) -> Dict[str, Any]:
     """Returns a simple self-check for a given week.
@@ -18,6 +20,10 @@ def get_weekly_checkin(user_id: str, week_start: str) -> Dict[str, Any]:
     """
     _ = date.fromisoformat(week_start)  # validate the format
 
+    fixture = get_week_fixture(user_id, week_start)
+    if fixture is not None and fixture.get("weekly_checkin"):
+        return {"week_start": week_start, **fixture["weekly_checkin"]}
+
     return {
         "week_start": week_start,
         "energy_level": 3,
@@ -0,0 +1,57 @@
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+# Synthetic weeks registered by the evaluation harness. When a (user, week)
+# has a fixture the tools serve it instead of their built-in demo data.
+# Use scenario_fixtures() so they are only served while a scenario runs.
+_WEEKS: Dict[Tuple[str, str], Dict[str, Any]] = {}
+_PROFILES: Dict[str, Dict[str, Any]] = {}
+
+
+def register_week_fixture(user_id: str, week_start: str, week: Dict[str, Any]) -> None:
+    """Serve `week` (calendar_events, workdays, weekly_checkin) for this user and week."""
+    _WEEKS[(user_id, week_start)] = week
+
+
+def register_profile_fixture(user_id: str, profile_and_history: Dict[str, Any]) -> None:
+    """Serve `profile_and_history` (user_profile, history_summary) for this user."""
+    _PROFILES[user_id] = profile_and_history
+
+
+def get_week_fixture(user_id: str, week_start: str) -> Optional[Dict[str, Any]]:
+    return _WEEKS.get((user_id, week_start))
+
+
+def get_profile_fixture(user_id: str) -> Optional[Dict[str, Any]]:
+    return _PROFILES.get(user_id)
+
+
+@contextmanager
+def scenario_fixtures(
+    user_id: str,
+    week_start: str,
+    week: Dict[str, Any],
+    profile_and_history: Dict[str, Any],
+) -> Iterator[None]:
+    """Serve a week and a profile for this user only inside the `with` block.
+
+    Whatever was registered before for the same user and week is restored
+    on exit, so the tools go back to their own data once a scenario is done.
+    """
+    week_key = (user_id, week_start)
+    previous_week = _WEEKS.get(week_key)
+    previous_profile = _PROFILES.get(user_id)
+    register_week_fixture(user_id, week_start, week)
+    register_profile_fixture(user_id, profile_and_history)
+    try:
+        yield
+    finally:
+        if previous_week is None:
+            _WEEKS.pop(week_key, None)
+        else:
+            _WEEKS[week_key] = previous_week
+        if previous_profile is None:
+            _PROFILES.pop(user_id, None)
+        else:
+            _PROFILES[user_id] = previous_profile
@@ -1,5 +1,7 @@
 from typing import Dict, Any
 
+from burnout_guardian.tools.fixtures import get_profile_fixture
+
 
 def get_profile_and_history(user_id: str) -> Dict[str, Any]:
     """Returns the user's work boundaries and a short history summary.
@@ -12,12 +14,17 @@ def get_profile_and_history(user_id: str) -> Dict[str, Any]:
           - user_profile: the person's own limits and preferences
           - history_summary: a compact view of recent weeks
     """
+    fixture = get_profile_fixture(user_id)
+    if fixture is not None:
+        return fixture
+
     user_profile = {
         "user_id": user_id,
         "preferred_work_hours": {"start": "09:00", "end": "18:00"},
         "max_hours_per_week": 45,
         "max_late_evenings_per_week": 2,
         "allow_weekend_work": False,
+        "timezone": "Europe/Rome",
     }
 
     history_summary = {
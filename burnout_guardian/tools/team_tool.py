@@ -0,0 +1,47 @@
+from typing import Any, Dict, List, Optional
+
+
+# For now this is a fake org directory with a couple of hard-coded teams.
+_TEAMS: Dict[str, Dict[str, Any]] = {
+    "platform": {
+        "department": "engineering",
+        "members": ["demo-user", "alice", "bob"],
+    },
+    "people-ops": {
+        "department": "hr",
+        "members": ["carol", "dave"],
+    },
+}
+
+
+def get_team_members(team_id: str) -> Dict[str, Any]:
+    """Returns the members of a team.
+
+    Args:
+        team_id: The id of the team, e.g. "platform".
+
+    Returns:
+        A dictionary with:
+          - team_id: the requested team
+          - department: the department the team belongs to
+          - members: list of user ids (empty if the team is unknown)
+    """
+    team = _TEAMS.get(team_id, {})
+    return {
+        "team_id": team_id,
+        "department": team.get("department"),
+        "members": list(team.get("members", [])),
+    }
+
+
+def find_user_team(user_id: str) -> Optional[Dict[str, str]]:
+    """Returns {"team_id", "department"} for the user, or None if unknown."""
+    for team_id, team in _TEAMS.items():
+        if user_id in team["members"]:
+            return {"team_id": team_id, "department": team["department"]}
+    return None
+
+
+def list_teams() -> List[str]:
+    """Returns the ids of all known teams."""
+    return list(_TEAMS)
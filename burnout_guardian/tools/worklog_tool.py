@@ -1,6 +1,10 @@
-from datetime import date
+from datetime import date, timedelta
 from typing import Dict, List, Any
 
+from burnout_guardian.normalize import normalize_workdays, source_timezones
+from burnout_guardian.tools.fixtures import get_week_fixture
+from burnout_guardian.tools.profile_tool import get_profile_and_history
+
 
 def get_workdays(user_id: str, period_start: str, period_end: str) -> Dict[str, List[Dict[str, Any]]]:
     """Returns a simple work log for each day in the given period.
@@ -17,43 +21,62 @@ def get_workdays(user_id: str, period_start: str, period_end: str) -> Dict[str,
           - first_activity_time: "HH:MM"
           - last_activity_time: "HH:MM"
           - tasks_completed: int
+        Days are bucketed in the user's local time (profile timezone).
     """
     start = date.fromisoformat(period_start)
 
+    fixture = get_week_fixture(user_id, period_start)
+    if fixture is not None:
+        return {"days": _local_days(user_id, fixture.get("workdays", []), period_start, period_end)}
+
     def t(h: int, m: int) -> str:
         return f"{h:02d}:{m:02d}"
 
     days: List[Dict[str, Any]] = [
         {
-            "date": start.isoformat(),  
+            "date": start.isoformat(),
             "first_activity_time": t(8, 45),
             "last_activity_time": t(22, 0),
             "tasks_completed": 7,
         },
         {
-            "date": (start.replace(day=start.day + 1)).isoformat(),  
+            "date": (start + timedelta(days=1)).isoformat(),
             "first_activity_time": t(9, 10),
             "last_activity_time": t(19, 0),
             "tasks_completed": 5,
         },
         {
-            "date": (start.replace(day=start.day + 2)).isoformat(),  
+            "date": (start + timedelta(days=2)).isoformat(),
             "first_activity_time": t(9, 0),
             "last_activity_time": t(18, 30),
             "tasks_completed": 4,
         },
         {
-            "date": (start.replace(day=start.day + 3)).isoformat(),  
+            "date": (start + timedelta(days=3)).isoformat(),
             "first_activity_time": t(9, 15),
             "last_activity_time": t(21, 30),
             "tasks_completed": 6,
         },
         {
-            "date": (start.replace(day=start.day + 4)).isoformat(),  
+            "date": (start + timedelta(days=4)).isoformat(),
             "first_activity_time": t(9, 0),
             "last_activity_time": t(18, 0),
             "tasks_completed": 3,
         },
     ]
 
-    return {"days": days}
+    return {"days": _local_days(user_id, days, period_start, period_end)}
+
+
+def _local_days(
+    user_id: str,
+    days: List[Dict[str, Any]],
+    period_start: str,
+    period_end: str,
+) -> List[Dict[str, Any]]:
+    user_profile = get_profile_and_history(user_id)["user_profile"]
+    tz_name = user_profile.get("timezone")
+    if tz_name:
+        _, worklog_tz = source_timezones(user_profile)
+        days = normalize_workdays(days, tz_name, assume_timezone=worklog_tz)
+    return [day for day in days if period_start <= day["date"] <= period_end]
@@ -0,0 +1,190 @@
+import json
+from datetime import date, datetime, time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+RISK_LEVELS = ("low", "medium", "high")
+EVENT_TYPES = ("meeting", "focus", "work", "break", "other")
+
+MAX_REPORTED_ITEM_ERRORS = 5
+
+_NUMBER = (int, float)
+_OPTIONAL_INT = (int, type(None))
+
+# stage name -> (root key of its JSON output, {field: accepted types})
+STAGE_SCHEMAS: Dict[str, Tuple[str, Dict[str, Any]]] = {
+    "data_collector": (
+        "week_snapshot",
+        {
+            "user_id": str,
+            "period_start": str,
+            "period_end": str,
+            "calendar_events": list,
+            "workdays": list,
+            "weekly_checkin": (dict, type(None)),
+        },
+    ),
+    "workload_analyzer": (
+        "weekly_metrics",
+        {
+            "user_id": str,
+            "period_start": str,
+            "period_end": str,
+            "total_hours": _NUMBER,
+            "avg_hours_per_day": _NUMBER,
+            "late_evenings": int,
+            "weekend_days_worked": int,
+            "meeting_hours": _NUMBER,
+            "num_meetings": int,
+            "days_without_real_breaks": int,
+            "checkin_energy": _OPTIONAL_INT,
+            "checkin_stress": _OPTIONAL_INT,
+        },
+    ),
+    "risk_scorer": (
+        "risk_assessment",
+        {
+            "user_id": str,
+            "period_start": str,
+            "period_end": str,
+            "risk_level": str,
+            "score": _NUMBER,
+            "reasons": list,
+        },
+    ),
+    "wellbeing_coach": (
+        "weekly_report",
+        {
+            "user_id": str,
+            "period_start": str,
+            "period_end": str,
+            "risk_level": str,
+            "summary_message": str,
+            "suggested_actions": list,
+        },
+    ),
+}
+
+
+class StageValidationError(RuntimeError):
+    """A pipeline stage kept returning output that does not match its schema."""
+
+    def __init__(self, stage: str, errors: List[str], attempts: int):
+        self.stage = stage
+        self.errors = errors
+        self.attempts = attempts
+        super().__init__(
+            f"Stage {stage} returned invalid output after {attempts} attempt(s): "
+            + "; ".join(errors)
+        )
+
+
+def clean_json_fences(text: str) -> str:
+    """Remove ```json fences if present and return raw JSON."""
+    cleaned = text.strip()
+    if cleaned.startswith("```"):
+        cleaned = cleaned.lstrip("`")
+        if cleaned.lower().startswith("json"):
+            cleaned = cleaned[4:].strip()
+        if cleaned.endswith("```"):
+            cleaned = cleaned[:-3].strip()
+    return cleaned
+
+
+def _check_week_snapshot(obj: Dict[str, Any]) -> List[str]:
+    """Check every event and workday, so bad collector output is retried at its source."""
+    errors = []
+    for index, event in enumerate(obj["calendar_events"]):
+        where = f"week_snapshot.calendar_events[{index}]"
+        if not isinstance(event, dict):
+            errors.append(f"{where} is not an object")
+            continue
+        missing = [key for key in ("id", "start_time", "end_time", "type") if key not in event]
+        if missing:
+            errors.append(f"{where} is missing {missing}")
+            continue
+        try:
+            start = datetime.fromisoformat(event["start_time"])
+            end = datetime.fromisoformat(event["end_time"])
+        except (TypeError, ValueError):
+            errors.append(f"{where} start_time/end_time must be ISO timestamps")
+            continue
+        if (start.tzinfo is None) != (end.tzinfo is None):
+            errors.append(f"{where} mixes naive and timezone-aware timestamps")
+        elif end < start:
+            errors.append(f"{where} ends before it starts")
+        if event["type"] not in EVENT_TYPES:
+            errors.append(f"{where}.type must be one of {list(EVENT_TYPES)}")
+
+    for index, workday in enumerate(obj["workdays"]):
+        where = f"week_snapshot.workdays[{index}]"
+        if not isinstance(workday, dict):
+            errors.append(f"{where} is not an object")
+            continue
+        missing = [
+            key
+            for key in ("date", "first_activity_time", "last_activity_time")
+            if key not in workday
+        ]
+        if missing:
+            errors.append(f"{where} is missing {missing}")
+            continue
+        try:
+            date.fromisoformat(workday["date"])
+            time.fromisoformat(workday["first_activity_time"])
+            time.fromisoformat(workday["last_activity_time"])
+        except (TypeError, ValueError):
+            errors.append(f"{where} needs date YYYY-MM-DD and activity times HH:MM")
+
+    # Keep the retry message short: the first few problems are enough.
+    return errors[:MAX_REPORTED_ITEM_ERRORS]
+
+
+def _check_semantics(root_key: str, obj: Dict[str, Any]) -> List[str]:
+    errors = []
+    if root_key == "week_snapshot":
+        errors.extend(_check_week_snapshot(obj))
+    if "risk_level" in obj and obj["risk_level"] not in RISK_LEVELS:
+        errors.append(f"risk_level must be one of {list(RISK_LEVELS)}")
+    if root_key == "risk_assessment" and isinstance(obj.get("score"), _NUMBER):
+        if not 0 <= obj["score"] <= 1:
+            errors.append("score must be between 0 and 1")
+    if root_key == "weekly_report" and not obj.get("suggested_actions"):
+        errors.append("suggested_actions is missing or empty")
+    return errors
+
+
+def validate_stage_output(
+    stage: str, text: Optional[str]
+) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """Parse a stage's final text and check it against the stage schema.
+
+    Returns:
+        (data, errors): the parsed JSON (None if it could not be parsed) and
+        a list of human readable problems, empty when the output is valid.
+    """
+    root_key, fields = STAGE_SCHEMAS[stage]
+
+    if not text or text == "None":
+        return None, ["No final response from agent"]
+
+    try:
+        data = json.loads(clean_json_fences(text))
+    except json.JSONDecodeError as e:
+        return None, [f"Invalid JSON: {e}"]
+
+    obj = data.get(root_key) if isinstance(data, dict) else None
+    if not isinstance(obj, dict):
+        return data, [f"Missing or invalid '{root_key}' object"]
+
+    missing = [key for key in fields if key not in obj]
+    if missing:
+        return data, [f"Missing keys in {root_key}: {missing}"]
+
+    errors = [
+        f"{root_key}.{key} has type {type(obj[key]).__name__}"
+        for key, expected in fields.items()
+        if not isinstance(obj[key], expected) or isinstance(obj[key], bool)
+    ]
+    errors.extend(_check_semantics(root_key, obj))
+    return data, errors
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import re
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from google.adk.memory import BaseMemoryService
+from google.adk.memory.base_memory_service import SearchMemoryResponse
+from google.adk.memory.memory_entry import MemoryEntry
+from google.genai import types
+
+from burnout_guardian.validation import clean_json_fences, validate_stage_output
+
+
+WEEKLY_MEMORY_NAMESPACE = "weekly_memory"
+
+# Oldest weeks are dropped beyond this, so memory per user stays bounded.
+MAX_WEEKS_PER_USER = 26
+# How many past weeks a search returns.
+RECALL_WEEKS = 4
+
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def _parse_state_json(value: Any, root_key: str) -> Optional[Dict[str, Any]]:
+    """Read a stage output (output_key) back from session state."""
+    if isinstance(value, str):
+        try:
+            value = json.loads(clean_json_fences(value))
+        except json.JSONDecodeError:
+            return None
+    obj = value.get(root_key) if isinstance(value, dict) else None
+    return obj if isinstance(obj, dict) else None
+
+
+def build_week_summary(state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Compact record of one week (metrics, risk, actions) from the session state.
+
+    Returns None when the session has no weekly_report yet, or when it does
+    not pass the wellbeing_coach validation (e.g. a failed attempt).
+    """
+    raw = state.get("weekly_report")
+    if isinstance(raw, dict):
+        raw = json.dumps(raw)
+    parsed, errors = validate_stage_output("wellbeing_coach", raw)
+    if errors:
+        return None
+    report = parsed["weekly_report"]
+    metrics = _parse_state_json(state.get("weekly_metrics"), "weekly_metrics") or {}
+    risk = _parse_state_json(state.get("risk_assessment"), "risk_assessment") or {}
+
+    actions = [
+        {"type": action.get("type"), "description": action.get("description")}
+        for action in report.get("suggested_actions", [])
+        if isinstance(action, dict)
+    ]
+    keywords = {report.get("risk_level"), *(action["type"] for action in actions)}
+    if metrics.get("late_evenings"):
+        keywords.add("late")
+    if metrics.get("weekend_days_worked"):
+        keywords.add("weekend")
+
+    return {
+        "period_start": report["period_start"],
+        "period_end": report.get("period_end"),
+        "risk_level": report.get("risk_level"),
+        "score": risk.get("score"),
+        "metrics": {
+            key: metrics.get(key)
+            for key in (
+                "total_hours",
+                "late_evenings",
+                "weekend_days_worked",
+                "meeting_hours",
+                "checkin_energy",
+                "checkin_stress",
+            )
+        },
+        "actions": actions,
+        "keywords": sorted(keyword for keyword in keywords if keyword),
+    }
+
+
+def format_week_summary(summary: Dict[str, Any]) -> str:
+    """One short line per week: what the coach reads back from memory."""
+    metrics = summary["metrics"]
+    facts = [f"risk {summary['risk_level']}"]
+    if metrics.get("total_hours") is not None:
+        facts.append(f"{metrics['total_hours']}h worked")
+    if metrics.get("late_evenings") is not None:
+        facts.append(f"{metrics['late_evenings']} late evenings")
+    if metrics.get("weekend_days_worked"):
+        facts.append(f"{metrics['weekend_days_worked']} weekend days")
+    if metrics.get("checkin_stress") is not None:
+        facts.append(f"stress {metrics['checkin_stress']}/5")
+    text = f"Week {summary['period_start']}: " + ", ".join(facts) + "."
+    descriptions = [action["description"] for action in summary["actions"] if action["description"]]
+    if descriptions:
+        text += " Suggested: " + "; ".join(descriptions)
+    return text
+
+
+class WeeklySummaryMemoryService(BaseMemoryService):
+    """Long-term memory holding one compact summary per user and week.
+
+    Instead of whole sessions (raw events, intermediate JSON), only the week's
+    metrics, risk and suggested actions are kept, at most MAX_WEEKS_PER_USER
+    of them. A search returns the RECALL_WEEKS weeks before the date found in
+    the query (or the latest ones), optionally narrowed by keywords such as a
+    risk level, so the coach reads a few short lines instead of transcripts.
+    """
+
+    def __init__(self, store):
+        self._store = store
+
+    async def add_session_to_memory(self, session) -> None:
+        summary = build_week_summary(dict(session.state))
+        if summary is None:
+            return
+
+        key = f"{session.app_name}:{session.user_id}"
+
+        def apply(current: Dict[str, Optional[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+            weeks = dict((current[key] or {}).get("weeks", {}))
+            weeks[summary["period_start"]] = summary
+            kept = sorted(weeks)[-MAX_WEEKS_PER_USER:]
+            return {key: {"weeks": {week: weeks[week] for week in kept}}}
+
+        # The SQLite store may wait on another worker's lock: keep it off the event loop.
+        await asyncio.to_thread(self._store.transact, WEEKLY_MEMORY_NAMESPACE, [key], apply)
+
+    async def search_memory(
+        self, *, app_name: str, user_id: str, query: str
+    ) -> SearchMemoryResponse:
+        key = f"{app_name}:{user_id}"
+        stored = await asyncio.to_thread(self._store.get_many, WEEKLY_MEMORY_NAMESPACE, [key])
+        weeks = (stored[key] or {}).get("weeks", {})
+
+        dates = _ISO_DATE.findall(query)
+        candidates = sorted(
+            (week for week in weeks if not dates or week < min(dates)),
+            reverse=True,
+        )
+
+        all_keywords = {keyword for summary in weeks.values() for keyword in summary["keywords"]}
+        wanted = {word.lower() for word in re.findall(r"\w+", query)} & all_keywords
+        if wanted:
+            candidates = [week for week in candidates if wanted & set(weeks[week]["keywords"])]
+
+        response = SearchMemoryResponse()
+        for week in candidates[:RECALL_WEEKS]:
+            response.memories.append(
+                MemoryEntry(
+                    content=types.Content(
+                        role="model", parts=[types.Part(text=format_week_summary(weeks[week]))]
+                    ),
+                    author="weekly_memory",
+                    timestamp=datetime.fromisoformat(week).isoformat(),
+                )
+            )
+        return response
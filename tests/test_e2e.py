@@ -1,101 +1,120 @@
 """Lightweight end-to-end style tests for the evaluation pipeline."""
 
 import asyncio
-from contextlib import redirect_stdout
 from datetime import date
-from io import StringIO
-from types import SimpleNamespace
 
 from burnout_guardian.app import evaluate_e2e
+from burnout_guardian.app.pipeline import PipelineResult, StageStats
+from burnout_guardian.validation import StageValidationError
 
 
-class _DummyEvent:
-    """Mimics the ADK event interface used in run_single_scenario."""
+def _fake_pipeline(outcome):
+    """Pipeline substitute returning `outcome`, or raising it when it is an exception."""
+    calls = []
 
-    def __init__(self, text: str | None):
-        self._text = text
-        self.content = SimpleNamespace(parts=[SimpleNamespace(text=text)])
+    async def pipeline(**kwargs):
+        calls.append(kwargs)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
 
-    def is_final_response(self) -> bool:
-        return True
+    pipeline.calls = calls
+    return pipeline
 
 
-class _DummySessionService:
-    async def create_session(self, **kwargs) -> None:
-        self.last_call = kwargs
-
-
-class _DummyRunner:
-    """Minimal runner substitute that yields predefined events."""
-
-    def __init__(self, responses: list[str]):
-        self._responses = responses
-        self.session_service = _DummySessionService()
-        self.app_name = "burnout_guardian_test"
-
-    async def run_async(self, **kwargs):
-        for text in self._responses:
-            yield _DummyEvent(text)
-
-
-def _run_and_capture(coro) -> str:
-    """Execute the async scenario helper and capture stdout."""
-    buffer = StringIO()
-    with redirect_stdout(buffer):
-        asyncio.run(coro)
-    return buffer.getvalue()
+def _run_single(pipeline):
+    return asyncio.run(
+        evaluate_e2e.run_single_scenario(
+            scenario_name="demo",
+            user_id="demo-user",
+            period_start=date(2025, 11, 10),
+            period_end=date(2025, 11, 16),
+            pipeline=pipeline,
+        )
+    )
 
 
 def test_run_single_scenario_success():
-    """run_single_scenario should report success when JSON is valid."""
-    weekly_report_json = """
-    {
-      "weekly_report": {
-        "user_id": "demo-user",
-        "period_start": "2025-11-10",
-        "period_end": "2025-11-16",
-        "risk_level": "medium",
-        "summary_message": "All good",
-        "suggested_actions": [{"type": "boundary", "description": "log off by 18:30", "impact": "protect evenings"}]
-      }
-    }
-    """
-    fake_runner = _DummyRunner([weekly_report_json])
-    original_runner = evaluate_e2e.runner
-    evaluate_e2e.runner = fake_runner
-    try:
-        output = _run_and_capture(
-            evaluate_e2e.run_single_scenario(
-                scenario_name="demo_success",
-                user_id="demo-user",
-                period_start=date(2025, 11, 10),
-                period_end=date(2025, 11, 16),
-                session_id="test-session",
-            )
+    """run_single_scenario returns the risk level and stage stats of a valid run."""
+    stages = [StageStats(stage="wellbeing_coach", attempts=1, latency_s=0.1, llm_calls=1)]
+    pipeline = _fake_pipeline(
+        PipelineResult(
+            data={"weekly_report": {"risk_level": "medium"}}, stage_outputs={}, stages=stages
         )
-    finally:
-        evaluate_e2e.runner = original_runner
-
-    assert "weekly_report OK" in output
-
-
-def test_run_single_scenario_missing_weekly_report():
-    """run_single_scenario should flag responses missing weekly_report."""
-    invalid_json = '{"not_weekly": {}}'
-    fake_runner = _DummyRunner([invalid_json])
-    original_runner = evaluate_e2e.runner
-    evaluate_e2e.runner = fake_runner
-    try:
-        output = _run_and_capture(
-            evaluate_e2e.run_single_scenario(
-                scenario_name="demo_missing_report",
-                user_id="demo-user",
-                period_start=date(2025, 11, 10),
-                period_end=date(2025, 11, 16),
-                session_id="test-session",
+    )
+
+    result = _run_single(pipeline)
+
+    assert result.valid
+    assert result.risk_level == "medium"
+    assert result.stages == stages
+    assert result.errors == []
+    call = pipeline.calls[0]
+    assert call["user_id"] == "demo-user"
+    assert call["period_start"] == date(2025, 11, 10)
+    assert call["session_id"].startswith("eval-demo-")
+
+
+def test_run_single_scenario_reports_invalid_output():
+    """A stage that keeps failing its schema makes the result invalid, with the reason."""
+    error = StageValidationError(
+        "wellbeing_coach", ["Missing or invalid 'weekly_report' object."], attempts=3
+    )
+
+    result = _run_single(_fake_pipeline(error))
+
+    assert not result.valid
+    assert result.risk_level is None
+    assert "Missing or invalid 'weekly_report'" in result.errors[0]
+
+
+def test_load_scenarios_reads_the_shipped_corpus():
+    """Every shipped scenario file must parse and declare a valid risk band."""
+    scenarios = evaluate_e2e.load_scenarios()
+    assert len(scenarios) >= 3
+    for scenario in scenarios:
+        assert scenario.expected_risk_levels
+        assert set(scenario.expected_risk_levels) <= {"low", "medium", "high"}
+        assert scenario.period_start <= scenario.period_end
+
+
+def test_run_corpus_builds_a_scorecard():
+    """The corpus runner serves each scenario's week to the tools and scores the results."""
+    from burnout_guardian.tools.fixtures import get_profile_fixture, get_week_fixture
+    from burnout_guardian.tools.worklog_tool import get_workdays
+
+    scenarios = evaluate_e2e.load_scenarios()
+
+    async def fake_pipeline(user_id, period_start, period_end, session_id):
+        days = get_workdays(user_id, period_start.isoformat(), period_end.isoformat())["days"]
+        if user_id == "eval-weekend-creep":
+            raise RuntimeError("Stage risk_scorer returned invalid output")
+        long_days = sum(1 for day in days if day["last_activity_time"] > "20:00")
+        risk_level = "high" if long_days >= 3 else "low"
+        stages = [
+            StageStats(
+                stage="risk_scorer", attempts=1, latency_s=0.1, llm_calls=2, prompt_tokens=100
             )
+        ]
+        return PipelineResult(
+            data={"weekly_report": {"risk_level": risk_level}}, stage_outputs={}, stages=stages
         )
-    finally:
-        evaluate_e2e.runner = original_runner
 
-    assert "Missing or invalid 'weekly_report'" in output
+    results = asyncio.run(
+        evaluate_e2e.run_corpus(scenarios, max_concurrency=2, pipeline=fake_pipeline)
+    )
+    scorecard = evaluate_e2e.build_scorecard(results, label="fake")
+    by_name = {result["name"]: result for result in scorecard["results"]}
+
+    assert scorecard["scenarios"] == len(scenarios)
+    assert by_name["crunch_week"]["risk_level"] == "high"
+    assert by_name["calm_week"]["risk_level"] == "low"
+    assert by_name["weekend_creep"]["valid"] is False
+    assert scorecard["schema_valid_rate"] == round((len(scenarios) - 1) / len(scenarios), 3)
+    assert scorecard["llm_calls_per_report"] == 2
+    assert scorecard["stage_latency_s"]["risk_scorer"]["p50"] == 0.1
+
+    # The synthetic weeks and profiles are no longer served once the run is over.
+    for scenario in scenarios:
+        assert get_week_fixture(scenario.user_id, scenario.period_start.isoformat()) is None
+        assert get_profile_fixture(scenario.user_id) is None
@@ -0,0 +1,150 @@
+"""Tests for incremental week ingestion and the shared metric definitions."""
+
+from datetime import date
+
+import pytest
+
+from burnout_guardian.ingestion import WeekIngestor
+from burnout_guardian.metrics import weekly_metrics_from_snapshot
+from burnout_guardian.state_store import InMemoryKeyValueStore
+from burnout_guardian.tools.calendar_tool import get_calendar_events
+from burnout_guardian.tools.profile_tool import get_profile_and_history
+from burnout_guardian.tools.worklog_tool import get_workdays
+
+PROFILE = get_profile_and_history("demo-user")["user_profile"]
+WEEK = date(2025, 11, 10)
+
+
+def _workday(day: str, first: str, last: str) -> dict:
+    return {
+        "op": "append",
+        "kind": "workday",
+        "date": day,
+        "data": {"date": day, "first_activity_time": first, "last_activity_time": last},
+    }
+
+
+def test_incremental_matches_full_week_computation() -> None:
+    """Feeding the demo week as deltas gives the same metrics as the batch path."""
+    events = get_calendar_events("demo-user", "2025-11-10T00:00:00", "2025-11-16T23:59:59")[
+        "events"
+    ]
+    days = get_workdays("demo-user", "2025-11-10", "2025-11-16")["days"]
+
+    ingestor = WeekIngestor(InMemoryKeyValueStore())
+    for event in events:
+        ingestor.ingest(
+            "demo-user", WEEK, [{"op": "append", "kind": "event", "data": event}], PROFILE
+        )
+    for day in days:
+        # Append a placeholder first so the real values arrive as an update.
+        ingestor.ingest("demo-user", WEEK, [_workday(day["date"], "09:00", "09:00")], PROFILE)
+        result = ingestor.ingest(
+            "demo-user",
+            WEEK,
+            [{"op": "update", "kind": "workday", "date": day["date"], "data": day}],
+            PROFILE,
+        )
+
+    snapshot = {
+        "user_id": "demo-user",
+        "period_start": "2025-11-10",
+        "period_end": "2025-11-16",
+        "calendar_events": events,
+        "workdays": days,
+    }
+    assert result["weekly_metrics"] == weekly_metrics_from_snapshot(snapshot, PROFILE)
+
+
+def test_threshold_crossing_is_flagged_once() -> None:
+    """Crossing max_late_evenings_per_week is reported when it happens, not on every delta."""
+    ingestor = WeekIngestor(InMemoryKeyValueStore())
+    limit = PROFILE["max_late_evenings_per_week"]
+
+    for n in range(limit):
+        result = ingestor.ingest("u", WEEK, [_workday(f"2025-11-1{n}", "09:00", "21:00")], PROFILE)
+        assert result["threshold_crossings"] == []
+
+    crossing = ingestor.ingest("u", WEEK, [_workday("2025-11-14", "09:00", "21:00")], PROFILE)
+    assert crossing["threshold_crossings"] == [
+        {"threshold": "max_late_evenings_per_week", "limit": limit, "value": limit + 1}
+    ]
+
+    again = ingestor.ingest("u", WEEK, [_workday("2025-11-14", "09:00", "22:00")], PROFILE)
+    assert again["threshold_crossings"] == []
+
+
+def test_deleting_an_event_updates_its_day() -> None:
+    """Deletes remove the event's contribution from the running week."""
+    ingestor = WeekIngestor(InMemoryKeyValueStore())
+    meeting = {
+        "id": "m1",
+        "start_time": "2025-11-11T10:00:00",
+        "end_time": "2025-11-11T11:30:00",
+        "type": "meeting",
+    }
+
+    added = ingestor.ingest(
+        "u", WEEK, [{"op": "append", "kind": "event", "data": meeting}], PROFILE
+    )
+    assert added["weekly_metrics"]["meeting_hours"] == 1.5
+
+    removed = ingestor.ingest("u", WEEK, [{"op": "delete", "kind": "event", "id": "m1"}], PROFILE)
+    assert removed["weekly_metrics"]["meeting_hours"] == 0
+    assert removed["weekly_metrics"]["num_meetings"] == 0
+
+
+def test_workday_delete_needs_a_date_inside_the_week() -> None:
+    """A workday delete without a date, or outside the week, is rejected."""
+    ingestor = WeekIngestor(InMemoryKeyValueStore())
+
+    with pytest.raises(ValueError):
+        ingestor.ingest("u", WEEK, [{"op": "delete", "kind": "workday"}], PROFILE)
+    with pytest.raises(ValueError):
+        ingestor.ingest(
+            "u", WEEK, [{"op": "delete", "kind": "workday", "date": "2025-12-01"}], PROFILE
+        )
+
+    result = ingestor.ingest(
+        "u", WEEK, [{"op": "delete", "kind": "workday", "date": "2025-11-12"}], PROFILE
+    )
+    assert result["weekly_metrics"]["total_hours"] == 0
+
+
+def test_incremental_matches_batch_with_a_worklog_timezone() -> None:
+    """Work log entries split across local days are merged like the batch path merges them."""
+    profile = {**PROFILE, "timezone": "America/Los_Angeles", "worklog_timezone": "UTC"}
+    days = [
+        {"date": "2025-11-11", "first_activity_time": "08:00", "last_activity_time": "23:00"},
+        {"date": "2025-11-12", "first_activity_time": "03:00", "last_activity_time": "20:00"},
+    ]
+
+    def batch(workdays):
+        snapshot = {
+            "user_id": "u",
+            "period_start": "2025-11-10",
+            "period_end": "2025-11-16",
+            "calendar_events": [],
+            "workdays": workdays,
+        }
+        return weekly_metrics_from_snapshot(snapshot, profile, from_sources=True)
+
+    ingestor = WeekIngestor(InMemoryKeyValueStore())
+    for day in days:
+        result = ingestor.ingest("u", WEEK, [_workday(day["date"], "09:00", "10:00")], profile)
+        result = ingestor.ingest(
+            "u", WEEK, [{"op": "update", "kind": "workday", "data": day}], profile
+        )
+    assert result["weekly_metrics"] == batch(days)
+
+    # An update that no longer reaches the previous local day leaves nothing behind there.
+    shorter = {**days[1], "first_activity_time": "09:00"}
+    result = ingestor.ingest(
+        "u", WEEK, [{"op": "update", "kind": "workday", "data": shorter}], profile
+    )
+    assert result["weekly_metrics"] == batch([days[0], shorter])
+
+    result = ingestor.ingest(
+        "u", WEEK, [{"op": "delete", "kind": "workday", "date": "2025-11-11"}], profile
+    )
+    assert result["weekly_metrics"] == batch([shorter])
@@ -0,0 +1,185 @@
+"""Tests for the pooled, hedging model client, run against a local stub server."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+import pytest
+from google.adk.models.llm_request import LlmRequest
+from google.genai import types
+
+from burnout_guardian.model_client import (
+    LatencyTracker,
+    ModelClientConfig,
+    ModelTimeoutError,
+    SharedModelClient,
+    build_model,
+    hedged_call,
+)
+
+
+class _StubGemini(BaseHTTPRequestHandler):
+    """Answers generateContent with a canned reply, after a scripted delay."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):  # noqa: N802 (http.server API)
+        server = self.server
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with server.lock:
+            server.client_ports.append(self.client_address[1])
+            delay = server.delays.pop(0) if server.delays else 0.0
+        time.sleep(delay)
+        body = json.dumps(
+            {"candidates": [{"content": {"role": "model", "parts": [{"text": f"slept {delay}"}]}}]}
+        ).encode()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client cancelled this request (hedge loser, timeout)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubGemini)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.client_ports: List[int] = []
+    server.delays: List[float] = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _shared_client(server, **overrides) -> SharedModelClient:
+    config = ModelClientConfig(
+        base_url=f"http://127.0.0.1:{server.server_address[1]}/",
+        api_key="test-key",
+        **overrides,
+    )
+    return SharedModelClient(config)
+
+
+def _request() -> LlmRequest:
+    return LlmRequest(
+        model="gemini-2.0-flash",
+        contents=[types.Content(role="user", parts=[types.Part(text="hello")])],
+        config=types.GenerateContentConfig(),
+    )
+
+
+async def _generate(model) -> str:
+    responses = [response async for response in model.generate_content_async(_request())]
+    return responses[-1].content.parts[0].text
+
+
+def test_latency_percentile_is_nearest_rank() -> None:
+    tracker = LatencyTracker(window=4)
+    assert tracker.percentile(95) is None
+    for latency in (5.0, 1.0, 2.0, 3.0, 4.0):  # 5.0 falls out of the window
+        tracker.record(latency)
+    assert tracker.percentile(50) == 2.0
+    assert tracker.percentile(95) == 4.0
+
+
+def test_hedged_call_returns_the_faster_duplicate() -> None:
+    delays = [0.5, 0.0]
+    finished = []
+
+    async def call():
+        delay = delays.pop(0)
+        await asyncio.sleep(delay)
+        finished.append(delay)
+        return delay
+
+    async def main():
+        result = await hedged_call(call, hedge_after_s=0.05)
+        await asyncio.sleep(0.6)
+        return result
+
+    assert asyncio.run(main()) == 0.0
+    assert finished == [0.0]  # the slow original was cancelled
+
+
+def test_hedged_call_falls_back_when_one_copy_fails() -> None:
+    calls = []
+
+    async def call():
+        calls.append(None)
+        if len(calls) == 1:
+            await asyncio.sleep(0.1)
+            return "original"
+        raise RuntimeError("hedge failed")
+
+    assert asyncio.run(hedged_call(call, hedge_after_s=0.01)) == "original"
+
+
+def test_cancelling_a_hedged_call_cancels_the_pending_request() -> None:
+    """A stage timeout before the hedge point must not leave the call running."""
+    finished = []
+
+    async def call():
+        await asyncio.sleep(0.3)
+        finished.append(None)
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(hedged_call(call, hedge_after_s=0.5), timeout=0.1)
+        await asyncio.sleep(0.4)
+
+    asyncio.run(main())
+    assert finished == []
+
+
+def test_agents_share_keepalive_connections(stub_server) -> None:
+    """Calls from different stages go through one pooled connection."""
+    shared = _shared_client(stub_server)
+    collector = build_model("data_collector", "gemini-2.0-flash", shared)
+    coach = build_model("wellbeing_coach", "gemini-2.0-flash", shared)
+
+    async def main():
+        return [await _generate(collector), await _generate(coach), await _generate(collector)]
+
+    assert asyncio.run(main()) == ["slept 0.0"] * 3
+    assert len(set(stub_server.client_ports)) == 1
+    assert shared.stats()["data_collector"]["calls"] == 2
+
+
+def test_slow_call_is_hedged_after_the_percentile(stub_server) -> None:
+    shared = _shared_client(stub_server, hedge_percentile=90, hedge_min_samples=3)
+    model = build_model("risk_scorer", "gemini-2.0-flash", shared)
+    for _ in range(3):
+        shared.tracker("risk_scorer").record(0.2)
+    stub_server.delays[:] = [1.0, 0.0]
+
+    started = time.perf_counter()
+    assert asyncio.run(_generate(model)) == "slept 0.0"
+    assert time.perf_counter() - started < 0.9
+    assert len(stub_server.client_ports) == 2
+    stats = shared.stats()["risk_scorer"]
+    assert (stats["hedged"], stats["hedge_wins"]) == (1, 1)
+    # The recorded latency includes the wait before the hedge was sent.
+    assert shared.tracker("risk_scorer").percentile(100) > 0.2
+
+
+def test_stage_timeout_bounds_a_call(stub_server) -> None:
+    shared = _shared_client(stub_server, stage_timeouts_s={"risk_scorer": 0.2})
+    model = build_model("risk_scorer", "gemini-2.0-flash", shared)
+    stub_server.delays[:] = [1.0]
+
+    with pytest.raises(ModelTimeoutError, match="risk_scorer timed out after 0.2s"):
+        asyncio.run(_generate(model))
+    assert shared.stats()["risk_scorer"]["timeouts"] == 1
+    assert shared.tracker("risk_scorer").percentile(100) >= 0.2
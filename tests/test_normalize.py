@@ -0,0 +1,149 @@
+"""Tests for local-time normalization of events and work logs."""
+
+from burnout_guardian.metrics import weekly_metrics_from_snapshot
+from burnout_guardian.normalize import normalize_events, normalize_workdays
+from burnout_guardian.tools.fixtures import scenario_fixtures
+from burnout_guardian.tools.worklog_tool import get_workdays
+
+
+def test_workdays_cross_month_boundaries() -> None:
+    """Demo work log dates must roll over into the next month."""
+    days = get_workdays("demo-user", "2025-11-28", "2025-12-04")["days"]
+    assert [day["date"] for day in days] == [
+        "2025-11-28",
+        "2025-11-29",
+        "2025-11-30",
+        "2025-12-01",
+        "2025-12-02",
+    ]
+
+
+def test_events_are_converted_and_split_at_local_midnight() -> None:
+    """A UTC event ending after local midnight becomes one piece per local day."""
+    event = {
+        "id": "release",
+        "start_time": "2025-11-10T13:00:00+00:00",
+        "end_time": "2025-11-10T16:00:00+00:00",
+        "type": "work",
+    }
+    pieces = normalize_events([event], "Asia/Tokyo")  # UTC+9: 22:00 -> 01:00
+
+    assert [(p["start_time"], p["end_time"]) for p in pieces] == [
+        ("2025-11-10T22:00:00", "2025-11-11T00:00:00"),
+        ("2025-11-11T00:00:00", "2025-11-11T01:00:00"),
+    ]
+    assert [p["id"] for p in pieces] == ["release@2025-11-10", "release@2025-11-11"]
+    assert {p["source_id"] for p in pieces} == {"release"}
+
+
+def test_naive_timestamps_are_local_unless_a_source_zone_is_given() -> None:
+    """Naive values stay as they are, or are read in assume_timezone."""
+    event = {"id": "e", "start_time": "2025-03-30T07:00:00", "end_time": "2025-03-30T08:00:00"}
+
+    assert normalize_events([event], "Europe/Rome")[0]["start_time"] == "2025-03-30T07:00:00"
+    # DST starts in Rome on 2025-03-30: UTC+2 from 01:00 UTC onwards.
+    converted = normalize_events([event], "Europe/Rome", assume_timezone="UTC")[0]
+    assert converted["start_time"] == "2025-03-30T09:00:00"
+
+
+def test_workdays_are_rebucketed_by_local_day() -> None:
+    """A UTC work log that spills past local midnight is split and merged per day."""
+    workdays = [
+        {
+            "date": "2025-11-10",
+            "first_activity_time": "08:00",
+            "last_activity_time": "16:30",
+            "tasks_completed": 4,
+        },
+        {
+            "date": "2025-11-11",
+            "first_activity_time": "00:30",
+            "last_activity_time": "08:00",
+            "tasks_completed": 2,
+        },
+    ]
+    local = normalize_workdays(workdays, "Asia/Tokyo", assume_timezone="UTC")
+
+    assert local == [
+        {
+            "date": "2025-11-10",
+            "first_activity_time": "17:00",
+            "last_activity_time": "23:59",
+            "tasks_completed": 4,
+        },
+        {
+            "date": "2025-11-11",
+            "first_activity_time": "00:00",
+            "last_activity_time": "17:00",
+            "tasks_completed": 2,
+        },
+    ]
+
+
+def test_late_evenings_use_the_profile_timezone() -> None:
+    """The same UTC workday is a late evening in Tokyo but not in London."""
+    snapshot = {
+        "user_id": "u",
+        "period_start": "2025-11-10",
+        "period_end": "2025-11-16",
+        "calendar_events": [
+            {
+                "id": "e",
+                "start_time": "2025-11-10T08:00:00+00:00",
+                "end_time": "2025-11-10T12:00:00+00:00",
+                "type": "work",
+            },
+        ],
+        "workdays": [],
+    }
+    profile = {"preferred_work_hours": {"start": "09:00", "end": "18:00"}}
+
+    tokyo = weekly_metrics_from_snapshot(snapshot, {**profile, "timezone": "Asia/Tokyo"})
+    london = weekly_metrics_from_snapshot(snapshot, {**profile, "timezone": "Europe/London"})
+    assert tokyo["late_evenings"] == 1
+    assert london["late_evenings"] == 0
+
+
+def test_worklog_timezone_from_the_profile_is_applied_by_every_path() -> None:
+    """Naive work log times logged in UTC are re-bucketed to the person's local day."""
+    from datetime import date
+
+    from burnout_guardian.ingestion import WeekIngestor
+    from burnout_guardian.state_store import InMemoryKeyValueStore
+
+    profile = {
+        "preferred_work_hours": {"start": "09:00", "end": "18:00"},
+        "timezone": "Asia/Tokyo",
+        "worklog_timezone": "UTC",
+    }
+    workday = {
+        "date": "2025-11-10",
+        "first_activity_time": "08:00",
+        "last_activity_time": "16:30",
+        "tasks_completed": 4,
+    }
+    local_days = ["2025-11-10", "2025-11-11"]  # 17:00 -> 01:30 in Tokyo
+
+    snapshot = {
+        "user_id": "u",
+        "period_start": "2025-11-10",
+        "period_end": "2025-11-16",
+        "calendar_events": [],
+        "workdays": [workday],
+    }
+    batch = weekly_metrics_from_snapshot(snapshot, profile, from_sources=True)
+    assert batch["late_evenings"] == 1
+
+    result = WeekIngestor(InMemoryKeyValueStore()).ingest(
+        "u",
+        date(2025, 11, 10),
+        [{"op": "append", "kind": "workday", "date": "2025-11-10", "data": workday}],
+        profile,
+    )
+    assert result["weekly_metrics"] == batch
+
+    with scenario_fixtures(
+        "u", "2025-11-10", {"workdays": [workday]}, {"user_profile": profile, "history_summary": {}}
+    ):
+        days = get_workdays("u", "2025-11-10", "2025-11-16")["days"]
+    assert [day["date"] for day in days] == local_days
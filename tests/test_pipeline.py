@@ -0,0 +1,251 @@
+"""Tests for stage-level validation and selective retry in the pipeline."""
+
+import asyncio
+import json
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from burnout_guardian.app import pipeline
+from burnout_guardian.model_client import ModelTimeoutError
+from burnout_guardian.validation import StageValidationError, validate_stage_output
+
+PERIOD = {"user_id": "demo-user", "period_start": "2025-11-10", "period_end": "2025-11-16"}
+
+VALID_OUTPUTS = {
+    "data_collector": {
+        "week_snapshot": {**PERIOD, "calendar_events": [], "workdays": [], "weekly_checkin": None}
+    },
+    "workload_analyzer": {
+        "weekly_metrics": {
+            **PERIOD,
+            "total_hours": 41.5,
+            "avg_hours_per_day": 8.3,
+            "late_evenings": 1,
+            "weekend_days_worked": 0,
+            "meeting_hours": 6.0,
+            "num_meetings": 7,
+            "days_without_real_breaks": 2,
+            "checkin_energy": 3,
+            "checkin_stress": None,
+        }
+    },
+    "risk_scorer": {
+        "risk_assessment": {**PERIOD, "risk_level": "medium", "score": 0.5, "reasons": ["busy"]}
+    },
+    "wellbeing_coach": {
+        "weekly_report": {
+            **PERIOD,
+            "risk_level": "medium",
+            "summary_message": "Busy but manageable",
+            "suggested_actions": [{"type": "boundary", "description": "stop at 18:30"}],
+        }
+    },
+}
+
+
+class _Event:
+    def __init__(self, text: str):
+        self.content = SimpleNamespace(parts=[SimpleNamespace(text=text)])
+        self.usage_metadata = SimpleNamespace(prompt_token_count=100, candidates_token_count=20)
+
+    def is_final_response(self) -> bool:
+        return True
+
+
+class _SessionService:
+    async def create_session(self, **kwargs) -> None:
+        self.created = kwargs
+
+
+class _StageRunner:
+    """Replays the given answers (or raises them), one per attempt, for a single stage."""
+
+    def __init__(self, name: str, answers: list, session_service):
+        self.agent = SimpleNamespace(name=name, description=f"{name} step")
+        self.app_name = "burnout_guardian_test"
+        self.session_service = session_service
+        self.answers = list(answers)
+        self.messages = []
+
+    async def run_async(self, user_id, session_id, new_message):
+        self.messages.append(new_message.parts[0].text)
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        yield _Event(answer)
+
+
+def _runners(overrides: dict) -> list:
+    session_service = _SessionService()
+    return [
+        _StageRunner(stage, overrides.get(stage, [json.dumps(output)]), session_service)
+        for stage, output in VALID_OUTPUTS.items()
+    ]
+
+
+def _run(runners, max_stage_attempts: int = 3):
+    return asyncio.run(
+        pipeline.run_pipeline(
+            user_id="demo-user",
+            period_start=date(2025, 11, 10),
+            period_end=date(2025, 11, 16),
+            session_id="test-session",
+            max_stage_attempts=max_stage_attempts,
+            runners=runners,
+        )
+    )
+
+
+def test_only_the_failing_stage_is_retried() -> None:
+    """An invalid risk_scorer output is retried without re-running earlier stages."""
+    before = pipeline.stage_retry_counters()["risk_scorer"]["retries"]
+    runners = _runners(
+        {"risk_scorer": ["not json at all", json.dumps(VALID_OUTPUTS["risk_scorer"])]}
+    )
+
+    result = _run(runners)
+
+    attempts = {stats.stage: stats.attempts for stats in result.stages}
+    assert attempts == {
+        "data_collector": 1,
+        "workload_analyzer": 1,
+        "risk_scorer": 2,
+        "wellbeing_coach": 1,
+    }
+    assert "Invalid JSON" in runners[2].messages[1]
+    assert "period_start: 2025-11-10" in runners[2].messages[1]
+    assert result.data == VALID_OUTPUTS["wellbeing_coach"]
+    assert result.stage_outputs["weekly_metrics"]["total_hours"] == 41.5
+    assert result.stages[2].llm_calls == 2
+    assert pipeline.stage_retry_counters()["risk_scorer"]["retries"] == before + 1
+
+
+def test_stage_fails_after_bounded_attempts() -> None:
+    """A stage that never becomes valid raises after max_stage_attempts."""
+    invalid = json.dumps({"weekly_metrics": {"user_id": "demo-user"}})
+    runners = _runners({"workload_analyzer": [invalid, invalid]})
+
+    with pytest.raises(StageValidationError) as excinfo:
+        _run(runners, max_stage_attempts=2)
+
+    assert excinfo.value.stage == "workload_analyzer"
+    assert excinfo.value.attempts == 2
+    assert runners[2].messages == []
+
+
+def test_validate_stage_output_rejects_bad_values() -> None:
+    """Types and enumerations are checked, not only key presence."""
+    report = json.loads(json.dumps(VALID_OUTPUTS["wellbeing_coach"]))
+    report["weekly_report"]["risk_level"] = "extreme"
+    report["weekly_report"]["suggested_actions"] = []
+
+    _, errors = validate_stage_output("wellbeing_coach", json.dumps(report))
+    assert any("risk_level" in error for error in errors)
+    assert any("suggested_actions" in error for error in errors)
+
+
+def test_workload_analyzer_uses_the_shared_metric_definitions() -> None:
+    """weekly_metrics comes from burnout_guardian.metrics, as for /ingest."""
+    from burnout_guardian.agent_app import session_service, stage_runners
+    from burnout_guardian.metrics import weekly_metrics_from_snapshot
+    from burnout_guardian.tools.calendar_tool import get_calendar_events
+    from burnout_guardian.tools.profile_tool import get_profile_and_history
+    from burnout_guardian.tools.worklog_tool import get_workdays
+
+    snapshot = {
+        **PERIOD,
+        "calendar_events": get_calendar_events(
+            "demo-user", "2025-11-10T00:00:00", "2025-11-16T23:59:59"
+        )["events"],
+        "workdays": get_workdays("demo-user", "2025-11-10", "2025-11-16")["days"],
+        "weekly_checkin": None,
+    }
+    analyzer = next(r for r in stage_runners if r.agent.name == "workload_analyzer")
+
+    async def main():
+        await session_service.create_session(
+            app_name=analyzer.app_name,
+            user_id="demo-user",
+            session_id="analyzer-test",
+            state={"week_snapshot": json.dumps({"week_snapshot": snapshot})},
+        )
+        return await pipeline._run_stage_once(
+            analyzer, "demo-user", "analyzer-test", "next step", pipeline.StageStats("x")
+        )
+
+    parsed, errors = validate_stage_output("workload_analyzer", asyncio.run(main()))
+    assert errors == []
+    profile = get_profile_and_history("demo-user")["user_profile"]
+    assert parsed["weekly_metrics"] == weekly_metrics_from_snapshot(snapshot, profile)
+
+
+def test_each_stage_is_asked_for_its_own_output() -> None:
+    """The first message of a stage names its own output key and the period."""
+    runners = _runners({})
+    _run(runners)
+
+    for runner, output in zip(runners, VALID_OUTPUTS.values()):
+        (root_key,) = output
+        assert f"Return ONLY the {root_key} JSON" in runner.messages[0]
+        assert "period_start: 2025-11-10" in runner.messages[0]
+
+
+def test_week_snapshot_items_are_validated() -> None:
+    """A malformed event or workday fails data_collector, the stage that produced it."""
+    snapshot = json.loads(json.dumps(VALID_OUTPUTS["data_collector"]))
+    snapshot["week_snapshot"]["calendar_events"] = [
+        {"id": "m1", "start_time": "2025-11-10T09:00:00", "type": "meeting"},
+        {
+            "id": "m2",
+            "start_time": "2025-11-10T11:00:00",
+            "end_time": "2025-11-10T10:00:00",
+            "type": "meeting",
+        },
+    ]
+    snapshot["week_snapshot"]["workdays"] = [
+        {"date": "2025-11-10", "first_activity_time": "9am", "last_activity_time": "18:00"}
+    ]
+
+    _, errors = validate_stage_output("data_collector", json.dumps(snapshot))
+
+    assert errors == [
+        "week_snapshot.calendar_events[0] is missing ['end_time']",
+        "week_snapshot.calendar_events[1] ends before it starts",
+        "week_snapshot.workdays[0] needs date YYYY-MM-DD and activity times HH:MM",
+    ]
+
+
+def test_a_stage_timeout_is_retried_as_a_failed_attempt() -> None:
+    """A timed-out model call is counted and retried with the same message."""
+    before = dict(pipeline.stage_retry_counters()["risk_scorer"])
+    runners = _runners(
+        {
+            "risk_scorer": [
+                ModelTimeoutError("risk_scorer", 20.0),
+                json.dumps(VALID_OUTPUTS["risk_scorer"]),
+            ]
+        }
+    )
+
+    result = _run(runners)
+
+    assert result.stages[2].attempts == 2
+    assert result.stages[2].errors == ["Model call of stage risk_scorer timed out after 20s"]
+    assert runners[2].messages[1] == runners[2].messages[0]
+    counters = pipeline.stage_retry_counters()["risk_scorer"]
+    assert counters["attempts"] == before["attempts"] + 2
+    assert counters["retries"] == before["retries"] + 1
+
+
+def test_a_stage_that_keeps_timing_out_fails_with_a_readable_error() -> None:
+    before = pipeline.stage_retry_counters()["risk_scorer"]["failures"]
+    runners = _runners({"risk_scorer": [ModelTimeoutError("risk_scorer", 20.0)] * 2})
+
+    with pytest.raises(StageValidationError) as excinfo:
+        _run(runners, max_stage_attempts=2)
+
+    assert excinfo.value.attempts == 2
+    assert "timed out after 20s" in str(excinfo.value)
+    assert pipeline.stage_retry_counters()["risk_scorer"]["failures"] == before + 1
@@ -0,0 +1,68 @@
+"""Tests for the team / org risk rollups."""
+
+from datetime import date
+
+from burnout_guardian.rollups import RiskRollup, RollupEngine
+from burnout_guardian.state_store import InMemoryKeyValueStore, SqliteKeyValueStore
+
+PLATFORM = {"team_id": "platform", "department": "engineering"}
+PEOPLE_OPS = {"team_id": "people-ops", "department": "hr"}
+
+
+def _report(user_id: str, risk_level: str, week_start: str = "2025-11-10") -> dict:
+    return {"user_id": user_id, "period_start": week_start, "risk_level": risk_level}
+
+
+def test_rollups_aggregate_reports_per_scope() -> None:
+    """Team, department and org rollups are updated by every report."""
+    engine = RollupEngine(InMemoryKeyValueStore())
+    engine.record(_report("a", "high"), {"total_hours": 50, "late_evenings": 3}, PLATFORM)
+    engine.record(_report("b", "low"), {"total_hours": 38, "late_evenings": 0}, PLATFORM)
+    engine.record(_report("c", "medium"), {"total_hours": 44, "late_evenings": 1}, PEOPLE_OPS)
+
+    team = engine.get("team", "platform", date(2025, 11, 10))
+    assert team["reports"] == 2
+    assert team["risk_levels"] == {"low": 1, "medium": 0, "high": 1}
+    assert team["high_risk_share"] == 0.5
+    assert team["avg_hours"] == 44.0
+    assert team["late_evening_rate"] == 0.5
+
+    org = engine.get("org", "all", date(2025, 11, 10))
+    assert org["reports"] == 3
+    assert 43.0 <= org["median_hours"] <= 45.0
+
+
+def test_rerunning_a_report_replaces_its_contribution() -> None:
+    """The same user and week must only be counted once."""
+    engine = RollupEngine(InMemoryKeyValueStore())
+    engine.record(_report("a", "high"), {"total_hours": 50, "late_evenings": 3}, PLATFORM)
+    engine.record(_report("a", "low"), {"total_hours": 40, "late_evenings": 0}, PEOPLE_OPS)
+
+    platform = engine.get("team", "platform", date(2025, 11, 10))
+    people_ops = engine.get("team", "people-ops", date(2025, 11, 10))
+    assert platform["reports"] == 0
+    assert people_ops["reports"] == 1
+    assert people_ops["risk_levels"]["low"] == 1
+    assert engine.get("org", "all", date(2025, 11, 10))["reports"] == 1
+
+
+def test_week_over_week_deltas(tmp_path) -> None:
+    """Deltas compare a week with the previous one, also through SQLite."""
+    engine = RollupEngine(SqliteKeyValueStore(str(tmp_path / "state.db")))
+    engine.record(_report("a", "low", "2025-11-03"), {"total_hours": 40}, PLATFORM)
+    engine.record(_report("a", "high", "2025-11-10"), {"total_hours": 52}, PLATFORM)
+
+    team = engine.get("team", "platform", date(2025, 11, 10))
+    assert team["week_over_week"]["avg_hours"] == 12.0
+    assert team["week_over_week"]["high_risk_share"] == 1.0
+
+
+def test_risk_rollups_merge() -> None:
+    """Merging two rollups equals recording all reports into one."""
+    left, right, both = RiskRollup(), RiskRollup(), RiskRollup()
+    for rollup, hours in ((left, 30.0), (right, 50.0)):
+        contribution = {"risk_level": "medium", "total_hours": hours, "late_evenings": 1}
+        rollup.add(contribution)
+        both.add(contribution)
+
+    assert left.merge(right).to_dict() == both.to_dict()
@@ -0,0 +1,114 @@
+"""Tests for the HTTP batch endpoint."""
+
+import json
+
+from fastapi.testclient import TestClient
+
+from burnout_guardian.app import serve_http
+
+
+async def _fake_run_weekly_report(user_id, period_start, period_end, session_id):
+    if user_id == "broken-user":
+        raise RuntimeError("Agent returned invalid JSON")
+    return {
+        "weekly_report": {
+            "user_id": user_id,
+            "period_start": period_start.isoformat(),
+            "period_end": period_end.isoformat(),
+            "risk_level": "low",
+            "summary_message": "Calm week",
+            "suggested_actions": [],
+        }
+    }
+
+
+def _post_batch(payload: dict):
+    original = serve_http.run_weekly_report
+    serve_http.run_weekly_report = _fake_run_weekly_report
+    try:
+        client = TestClient(serve_http.app)
+        return client.post("/weekly-reports:batch", json=payload)
+    finally:
+        serve_http.run_weekly_report = original
+
+
+def test_batch_streams_one_line_per_user_with_partial_failures() -> None:
+    """Each user gets its own NDJSON line; one failure does not abort the batch."""
+    response = _post_batch(
+        {
+            "user_ids": ["alice", "broken-user", "bob", "alice"],
+            "period_start": "2025-11-10",
+            "period_end": "2025-11-16",
+            "max_concurrency": 2,
+        }
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    results = {line["user_id"]: line for line in lines[:-1]}
+
+    assert set(results) == {"alice", "bob", "broken-user"}
+    assert results["alice"]["status"] == "ok"
+    assert results["alice"]["weekly_report"]["user_id"] == "alice"
+    assert results["broken-user"]["status"] == "error"
+    assert "invalid JSON" in results["broken-user"]["error"]
+    assert lines[-1] == {"batch_summary": {"total": 3, "succeeded": 2, "failed": 1}}
+
+
+def test_batch_resolves_team_members() -> None:
+    """A team_id expands to the team's members."""
+    response = _post_batch(
+        {"team_id": "people-ops", "period_start": "2025-11-10", "period_end": "2025-11-16"}
+    )
+    users = {json.loads(line).get("user_id") for line in response.text.splitlines()}
+    assert {"carol", "dave"} <= users
+
+
+def test_batch_rejects_ambiguous_or_unknown_targets() -> None:
+    """Exactly one of user_ids/team_id is required, and the team must exist."""
+    period = {"period_start": "2025-11-10", "period_end": "2025-11-16"}
+
+    assert _post_batch({"user_ids": ["a"], "team_id": "platform", **period}).status_code == 422
+    assert _post_batch({"team_id": "no-such-team", **period}).status_code == 404
+
+
+def test_weekly_report_uses_a_new_session_per_call() -> None:
+    """Without a session_id every call gets its own (session ids cannot be reused)."""
+    session_ids = []
+
+    async def fake(user_id, period_start, period_end, session_id):
+        session_ids.append(session_id)
+        return await _fake_run_weekly_report(user_id, period_start, period_end, session_id)
+
+    original = serve_http.run_weekly_report
+    serve_http.run_weekly_report = fake
+    try:
+        client = TestClient(serve_http.app)
+        payload = {"user_id": "alice", "period_start": "2025-11-10", "period_end": "2025-11-16"}
+        for _ in range(2):
+            assert client.post("/weekly-report", json=payload).status_code == 200
+    finally:
+        serve_http.run_weekly_report = original
+
+    assert len(set(session_ids)) == 2
+    assert all(session_id.startswith("weekly-2025-11-10-") for session_id in session_ids)
+
+
+def test_malformed_ingest_deltas_are_rejected_with_422() -> None:
+    """Bad delta shapes or field types are client errors, not server errors."""
+    client = TestClient(serve_http.app)
+    bad_deltas = [
+        {"op": "append", "kind": "workday", "data": "x"},
+        {
+            "op": "append",
+            "kind": "workday",
+            "data": {"date": "2025-11-11", "first_activity_time": 9, "last_activity_time": 18},
+        },
+        {"op": "delete", "kind": "workday"},
+    ]
+    for delta in bad_deltas:
+        response = client.post(
+            "/ingest/u-malformed", json={"week_start": "2025-11-10", "deltas": [delta]}
+        )
+        assert response.status_code == 422, delta
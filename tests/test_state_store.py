@@ -0,0 +1,96 @@
+"""Tests for the shared SQLite state used by multi-worker deployments."""
+
+import asyncio
+import json
+import multiprocessing
+import os
+from types import SimpleNamespace
+
+from burnout_guardian.state_store import (
+    STATE_DB_ENV,
+    SqliteKeyValueStore,
+    build_services,
+    prepare_state_db,
+)
+from burnout_guardian.weekly_memory import WeeklySummaryMemoryService
+
+
+def _session(week_start: str, risk_level: str) -> SimpleNamespace:
+    report = {
+        "weekly_report": {
+            "user_id": "demo-user",
+            "period_start": week_start,
+            "period_end": week_start,
+            "risk_level": risk_level,
+            "summary_message": "Busy week",
+            "suggested_actions": [{"type": "boundary", "description": "stop at 18:30"}],
+        }
+    }
+    return SimpleNamespace(
+        app_name="burnout_guardian",
+        user_id="demo-user",
+        id=f"session-{week_start}",
+        state={"weekly_report": json.dumps(report)},
+    )
+
+
+def test_memory_is_shared_between_workers(tmp_path) -> None:
+    """A week saved by one worker must be recalled by another one."""
+    db_path = str(tmp_path / "state.db")
+    worker_a = WeeklySummaryMemoryService(SqliteKeyValueStore(db_path))
+    worker_b = WeeklySummaryMemoryService(SqliteKeyValueStore(db_path))
+
+    asyncio.run(worker_a.add_session_to_memory(_session("2025-11-03", "high")))
+
+    response = asyncio.run(
+        worker_b.search_memory(app_name="burnout_guardian", user_id="demo-user", query="2025-11-10")
+    )
+    assert [m.content.parts[0].text for m in response.memories] == [
+        "Week 2025-11-03: risk high. Suggested: stop at 18:30"
+    ]
+
+    other_user = asyncio.run(
+        worker_b.search_memory(app_name="burnout_guardian", user_id="someone", query="2025-11-10")
+    )
+    assert other_user.memories == []
+
+
+def test_saving_a_week_again_replaces_it(tmp_path) -> None:
+    """Re-saving the same week must not duplicate memories."""
+    service = WeeklySummaryMemoryService(SqliteKeyValueStore(str(tmp_path / "state.db")))
+
+    asyncio.run(service.add_session_to_memory(_session("2025-11-03", "high")))
+    asyncio.run(service.add_session_to_memory(_session("2025-11-03", "low")))
+
+    response = asyncio.run(
+        service.search_memory(app_name="burnout_guardian", user_id="demo-user", query="")
+    )
+    assert len(response.memories) == 1
+    assert "risk low" in response.memories[0].content.parts[0].text
+
+
+def _create_session_in_worker(db_path: str, n: int) -> str:
+    """What a freshly started worker does on its first request."""
+    os.environ[STATE_DB_ENV] = db_path
+    session_service, _ = build_services()
+
+    async def first_request() -> None:
+        await session_service.create_session(
+            app_name="burnout_guardian", user_id=f"user-{n}", session_id=f"session-{n}"
+        )
+        await session_service.close()
+
+    asyncio.run(first_request())
+    return f"session-{n}"
+
+
+def test_workers_start_on_a_fresh_database(tmp_path) -> None:
+    """After prepare_state_db, workers never race to create the session schema."""
+    db_path = str(tmp_path / "state.db")
+    prepare_state_db(db_path)
+
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(8) as pool:
+        created = pool.starmap(_create_session_in_worker, [(db_path, n) for n in range(8)])
+
+    assert sorted(created) == sorted(f"session-{n}" for n in range(8))
@@ -0,0 +1,123 @@
+"""Tests for the compact per-week memory used by wellbeing_coach."""
+
+import asyncio
+import json
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from burnout_guardian import weekly_memory
+from burnout_guardian.state_store import InMemoryKeyValueStore
+from burnout_guardian.weekly_memory import WeeklySummaryMemoryService, build_week_summary
+
+
+def _state(week_start: str, risk_level: str, late_evenings: int = 0) -> dict:
+    return {
+        "week_snapshot": '{"week_snapshot": {"calendar_events": ["...lots of raw events..."]}}',
+        "weekly_metrics": "```json\n"
+        + json.dumps({"weekly_metrics": {"total_hours": 47.5, "late_evenings": late_evenings}})
+        + "\n```",
+        "risk_assessment": json.dumps({"risk_assessment": {"score": 0.7}}),
+        "weekly_report": json.dumps(
+            {
+                "weekly_report": {
+                    "user_id": "u",
+                    "period_start": week_start,
+                    "period_end": week_start,
+                    "risk_level": risk_level,
+                    "summary_message": "A long message the coach does not need to re-read.",
+                    "suggested_actions": [
+                        {"type": "experiment", "description": "no-meeting Friday"}
+                    ],
+                }
+            }
+        ),
+    }
+
+
+def _save_weeks(service, weeks) -> None:
+    for week_start, risk_level, late_evenings in weeks:
+        session = SimpleNamespace(
+            app_name="app",
+            user_id="u",
+            id=f"s-{week_start}",
+            state=_state(week_start, risk_level, late_evenings),
+        )
+        asyncio.run(service.add_session_to_memory(session))
+
+
+def _search(service, query: str) -> list:
+    response = asyncio.run(service.search_memory(app_name="app", user_id="u", query=query))
+    return [memory.content.parts[0].text for memory in response.memories]
+
+
+def test_summary_keeps_only_compact_fields() -> None:
+    """Raw events and long messages are not stored, only metrics, risk and actions."""
+    summary = build_week_summary(_state("2025-11-10", "high", late_evenings=3))
+
+    assert summary["risk_level"] == "high"
+    assert summary["score"] == 0.7
+    assert summary["metrics"]["total_hours"] == 47.5
+    assert summary["actions"] == [{"type": "experiment", "description": "no-meeting Friday"}]
+    assert "late" in summary["keywords"]
+    assert "calendar_events" not in json.dumps(summary)
+    assert "summary_message" not in summary
+
+
+def test_search_returns_the_last_weeks_before_the_period() -> None:
+    """The time index returns the most recent RECALL_WEEKS weeks before the queried one."""
+    service = WeeklySummaryMemoryService(InMemoryKeyValueStore())
+    start = date(2025, 9, 1)
+    _save_weeks(
+        service, [((start + timedelta(weeks=n)).isoformat(), "medium", 0) for n in range(10)]
+    )
+
+    texts = _search(service, "user_id: u\nperiod_start: 2025-10-20\nperiod_end: 2025-10-26")
+
+    assert len(texts) == weekly_memory.RECALL_WEEKS
+    assert texts[0].startswith("Week 2025-10-13")
+    assert texts[-1].startswith("Week 2025-09-22")
+
+
+def test_keywords_narrow_the_recall() -> None:
+    """Indexed keywords (risk level, late evenings...) filter the weeks returned."""
+    service = WeeklySummaryMemoryService(InMemoryKeyValueStore())
+    _save_weeks(
+        service,
+        [("2025-10-27", "high", 3), ("2025-11-03", "low", 0), ("2025-11-10", "high", 4)],
+    )
+
+    assert [text[:15] for text in _search(service, "high risk weeks")] == [
+        "Week 2025-11-10",
+        "Week 2025-10-27",
+    ]
+
+
+def test_memory_per_user_is_bounded() -> None:
+    """Only the newest MAX_WEEKS_PER_USER weeks are kept."""
+    store = InMemoryKeyValueStore()
+    service = WeeklySummaryMemoryService(store)
+    start = date(2025, 1, 6)
+    total = weekly_memory.MAX_WEEKS_PER_USER + 5
+    _save_weeks(
+        service, [((start + timedelta(weeks=n)).isoformat(), "low", 0) for n in range(total)]
+    )
+
+    stored = store.get_many(weekly_memory.WEEKLY_MEMORY_NAMESPACE, ["app:u"])["app:u"]["weeks"]
+    assert len(stored) == weekly_memory.MAX_WEEKS_PER_USER
+    assert min(stored) == (start + timedelta(weeks=5)).isoformat()
+
+
+def test_invalid_reports_are_not_saved() -> None:
+    """A coach attempt that fails validation never reaches memory."""
+    service = WeeklySummaryMemoryService(InMemoryKeyValueStore())
+    _save_weeks(service, [("2025-11-03", "high", 2)])
+
+    invalid = _state("2025-11-10", "severe")
+    assert build_week_summary(invalid) is None
+    asyncio.run(
+        service.add_session_to_memory(
+            SimpleNamespace(app_name="app", user_id="u", id="s-bad", state=invalid)
+        )
+    )
+
+    assert [text[:15] for text in _search(service, "")] == ["Week 2025-11-03"]